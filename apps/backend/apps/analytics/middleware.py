@@ -81,9 +81,9 @@ class AnalyticsMiddleware(MiddlewareMixin):
             'referrer_url': referrer or None,
             'user_agent': user_agent,
             'ip_address_hash': ip_hash,
-            'device_type': ua_data.get('device_type'),
-            'browser': ua_data.get('browser'),
-            'operating_system': ua_data.get('os'),
+            'device_type': ua_data.device_type,
+            'browser': ua_data.browser,
+            'operating_system': ua_data.os,
             'country': geo_data.get('country'),
             'city': geo_data.get('city'),
             'timestamp': timezone.now(),
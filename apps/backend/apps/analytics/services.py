@@ -143,7 +143,7 @@ class TrackEvents:
                 geo_data = get_geolocation(ip_address)
         
         # Parse user agent
-        ua_data = parse_user_agent(user_agent) if user_agent else {}
+        ua_data = parse_user_agent(user_agent)
         
         # Hash IP for GDPR
         ip_hash = hash_ip_address(ip_address) if ip_address else None
@@ -161,9 +161,9 @@ class TrackEvents:
             'referrer_url': referrer_url,
             'user_agent': user_agent,
             'ip_address_hash': ip_hash,
-            'device_type': ua_data.get('device_type', 'other'),
-            'browser': ua_data.get('browser'),
-            'operating_system': ua_data.get('os'),
+            'device_type': ua_data.device_type,
+            'browser': ua_data.browser,
+            'operating_system': ua_data.os,
             'country': geo_data.get('country'),
             'city': geo_data.get('city'),
             'duration': duration,
@@ -372,7 +372,7 @@ class TrackEvents:
         
         # Fallback: calculate from page views
         page_views = PageView.objects.filter(session_id=session_id).order_by('timestamp')
-        if page_views.count() >= 2:
+        if page_views[1:2].exists():
             first_view = page_views.first()
             last_view = page_views.last()
             duration = (last_view.timestamp - first_view.timestamp).total_seconds()
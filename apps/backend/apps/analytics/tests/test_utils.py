@@ -0,0 +1,110 @@
+"""
+Tests for Analytics utility functions
+"""
+from django.test import TestCase, RequestFactory, override_settings
+from apps.analytics.utils import parse_user_agent, should_track_request, extract_campaign_info
+
+
+class ParseUserAgentTest(TestCase):
+    """Test parse_user_agent"""
+
+    def test_empty_user_agent(self):
+        """Test parsing an empty user agent"""
+        info = parse_user_agent('')
+        self.assertIsNone(info.browser)
+        self.assertIsNone(info.os)
+        self.assertEqual(info.device_type, 'other')
+
+    def test_chrome_windows(self):
+        """Test parsing Chrome on Windows"""
+        info = parse_user_agent(
+            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+            '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+        )
+        self.assertEqual(info.browser, 'Chrome')
+        self.assertEqual(info.browser_version, '120.0.0.0')
+        self.assertEqual(info.os, 'Windows')
+        self.assertEqual(info.os_version, '10.0')
+        self.assertEqual(info.device_type, 'desktop')
+
+    def test_edge_takes_priority_over_chrome(self):
+        """Test Chromium Edge is reported as Edge"""
+        info = parse_user_agent(
+            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+            '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.2210.91'
+        )
+        self.assertEqual(info.browser, 'Edge')
+        self.assertEqual(info.browser_version, '120.0.2210.91')
+
+    def test_safari_macos(self):
+        """Test parsing Safari on macOS"""
+        info = parse_user_agent(
+            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 '
+            '(KHTML, like Gecko) Version/17.1 Safari/605.1.15'
+        )
+        self.assertEqual(info.browser, 'Safari')
+        self.assertEqual(info.browser_version, '17.1')
+        self.assertEqual(info.os, 'macOS')
+        self.assertEqual(info.os_version, '10.15.7')
+
+    def test_firefox_mobile(self):
+        """Test parsing Firefox on a mobile device"""
+        info = parse_user_agent('Mozilla/5.0 (Android 14; Mobile; rv:121.0) Gecko/121.0 Firefox/121.0')
+        self.assertEqual(info.browser, 'Firefox')
+        self.assertEqual(info.browser_version, '121.0')
+        self.assertEqual(info.os, 'Android')
+        self.assertEqual(info.os_version, '14')
+        self.assertEqual(info.device_type, 'mobile')
+
+
+class ShouldTrackRequestTest(TestCase):
+    """Test should_track_request"""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_excluded_path(self):
+        """Test excluded paths are not tracked"""
+        request = self.factory.get('/static/app.js', HTTP_COOKIE='analytics_consent=true')
+        self.assertFalse(should_track_request(request))
+
+    def test_bot_user_agent(self):
+        """Test bots are not tracked"""
+        request = self.factory.get('/', HTTP_USER_AGENT='Googlebot/2.1', HTTP_COOKIE='analytics_consent=true')
+        self.assertFalse(should_track_request(request))
+
+    def test_consent_cookie(self):
+        """Test requests with consent are tracked"""
+        request = self.factory.get('/pricing/', HTTP_COOKIE='analytics_consent=true')
+        self.assertTrue(should_track_request(request))
+
+    @override_settings(ANALYTICS_EXCLUDED_PATHS=['/pricing/'])
+    def test_excluded_paths_override(self):
+        """Test overridden settings are picked up"""
+        request = self.factory.get('/pricing/', HTTP_COOKIE='analytics_consent=true')
+        self.assertFalse(should_track_request(request))
+
+
+class ExtractCampaignInfoTest(TestCase):
+    """Test extract_campaign_info"""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_utm_and_referrer_domain(self):
+        """Test UTM parameters and referrer domain are extracted"""
+        request = self.factory.get(
+            '/?utm_source=google&utm_medium=cpc',
+            HTTP_REFERER='https://www.google.com:443/search?q=test'
+        )
+        info = extract_campaign_info(request)
+        self.assertEqual(info['source'], 'google')
+        self.assertEqual(info['medium'], 'cpc')
+        self.assertIsNone(info['campaign'])
+        self.assertEqual(info['referrer_domain'], 'www.google.com:443')
+
+    def test_referrer_without_scheme(self):
+        """Test scheme-relative referrers fall back to urlparse"""
+        request = self.factory.get('/', HTTP_REFERER='//example.com/page')
+        info = extract_campaign_info(request)
+        self.assertEqual(info['referrer_domain'], 'example.com')
@@ -4,11 +4,64 @@ Analytics utility functions
 import hashlib
 import re
 import logging
+from collections import namedtuple
+from functools import lru_cache
 from urllib.parse import urlparse, parse_qs
 from django.conf import settings
+from django.dispatch import receiver
+from django.test.signals import setting_changed
 
 logger = logging.getLogger(__name__)
 
+UserAgentInfo = namedtuple(
+    'UserAgentInfo', ('browser', 'browser_version', 'os', 'os_version', 'device_type')
+)
+
+_EMPTY_USER_AGENT_INFO = UserAgentInfo(None, None, None, None, 'other')
+
+# Version patterns, compiled once; only the branch that matched is searched
+_CHROME_VERSION_RE = re.compile(r'chrome/([\d.]+)')
+_FIREFOX_VERSION_RE = re.compile(r'firefox/([\d.]+)')
+_SAFARI_VERSION_RE = re.compile(r'version/([\d.]+)')
+_EDGE_VERSION_RE = re.compile(r'edg?e?/([\d.]+)')
+_OPERA_VERSION_RE = re.compile(r'opera/([\d.]+)')
+_WINDOWS_VERSION_RE = re.compile(r'windows nt ([\d.]+)')
+_MACOS_VERSION_RE = re.compile(r'mac os x ([\d_]+)')
+_ANDROID_VERSION_RE = re.compile(r'android ([\d.]+)')
+_IOS_VERSION_RE = re.compile(r'os ([\d_]+)')
+
+_UTM_KEYS = ('utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content')
+
+_BOT_KEYWORDS = ('bot', 'crawler', 'spider', 'scraper', 'monitor')
+
+_DEFAULT_EXCLUDED_PATHS = (
+    '/admin/',
+    '/api/admin/',
+    '/static/',
+    '/media/',
+    '/favicon.ico',
+)
+
+
+@lru_cache(maxsize=None)
+def _tracking_settings():
+    """
+    Read analytics tracking settings once instead of on every request
+    Returns tuple of (excluded_paths, exclude_staff, require_consent)
+    """
+    return (
+        tuple(getattr(settings, 'ANALYTICS_EXCLUDED_PATHS', _DEFAULT_EXCLUDED_PATHS)),
+        getattr(settings, 'ANALYTICS_EXCLUDE_STAFF', True),
+        getattr(settings, 'ANALYTICS_REQUIRE_CONSENT', True),
+    )
+
+
+@receiver(setting_changed)
+def _reset_tracking_settings(setting, **kwargs):
+    """Drop cached tracking settings when overridden (e.g. in tests)"""
+    if setting.startswith('ANALYTICS_'):
+        _tracking_settings.cache_clear()
+
 
 def anonymize_ip(ip_address):
     """
@@ -49,16 +102,11 @@ def hash_ip_address(ip_address):
 def parse_user_agent(user_agent_string):
     """
     Parse user agent string to extract browser, OS, and device info
-    Returns dict with: browser, browser_version, os, os_version, device_type
+    Returns UserAgentInfo with: browser, browser_version, os, os_version, device_type
+    (use ``_asdict()`` where a dict is needed)
     """
     if not user_agent_string:
-        return {
-            'browser': None,
-            'browser_version': None,
-            'os': None,
-            'os_version': None,
-            'device_type': 'other'
-        }
+        return _EMPTY_USER_AGENT_INFO
     
     ua = user_agent_string.lower()
     
@@ -75,27 +123,27 @@ def parse_user_agent(user_agent_string):
     
     if 'chrome' in ua and 'edg' not in ua:
         browser = 'Chrome'
-        match = re.search(r'chrome/([\d.]+)', ua)
+        match = _CHROME_VERSION_RE.search(ua)
         if match:
             browser_version = match.group(1)
     elif 'firefox' in ua:
         browser = 'Firefox'
-        match = re.search(r'firefox/([\d.]+)', ua)
+        match = _FIREFOX_VERSION_RE.search(ua)
         if match:
             browser_version = match.group(1)
     elif 'safari' in ua and 'chrome' not in ua:
         browser = 'Safari'
-        match = re.search(r'version/([\d.]+)', ua)
+        match = _SAFARI_VERSION_RE.search(ua)
         if match:
             browser_version = match.group(1)
     elif 'edg' in ua or 'edge' in ua:
         browser = 'Edge'
-        match = re.search(r'edg?e?/([\d.]+)', ua)
+        match = _EDGE_VERSION_RE.search(ua)
         if match:
             browser_version = match.group(1)
     elif 'opera' in ua:
         browser = 'Opera'
-        match = re.search(r'opera/([\d.]+)', ua)
+        match = _OPERA_VERSION_RE.search(ua)
         if match:
             browser_version = match.group(1)
     
@@ -105,49 +153,47 @@ def parse_user_agent(user_agent_string):
     
     if 'windows' in ua:
         os_name = 'Windows'
-        match = re.search(r'windows nt ([\d.]+)', ua)
+        match = _WINDOWS_VERSION_RE.search(ua)
         if match:
             os_version = match.group(1)
     elif 'mac' in ua or 'macintosh' in ua:
         os_name = 'macOS'
-        match = re.search(r'mac os x ([\d_]+)', ua)
+        match = _MACOS_VERSION_RE.search(ua)
         if match:
             os_version = match.group(1).replace('_', '.')
     elif 'linux' in ua:
         os_name = 'Linux'
     elif 'android' in ua:
         os_name = 'Android'
-        match = re.search(r'android ([\d.]+)', ua)
+        match = _ANDROID_VERSION_RE.search(ua)
         if match:
             os_version = match.group(1)
     elif 'ios' in ua or 'iphone' in ua or 'ipad' in ua:
         os_name = 'iOS'
-        match = re.search(r'os ([\d_]+)', ua)
+        match = _IOS_VERSION_RE.search(ua)
         if match:
             os_version = match.group(1).replace('_', '.')
     
-    return {
-        'browser': browser,
-        'browser_version': browser_version,
-        'os': os_name,
-        'os_version': os_version,
-        'device_type': device_type
-    }
+    return UserAgentInfo(browser, browser_version, os_name, os_version, device_type)
 
 
 def extract_utm_parameters(request):
     """
     Extract UTM parameters from request
     """
-    utm_params = {}
-    utm_keys = ['utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content']
-    
-    for key in utm_keys:
-        value = request.GET.get(key)
-        if value:
-            utm_params[key] = value
-    
-    return utm_params
+    get = request.GET.get
+    return {key: value for key in _UTM_KEYS if (value := get(key))}
+
+
+def _fast_netloc(url):
+    """
+    Extract the netloc from a scheme://host/... URL without a full urlparse
+    Returns '' when the URL has no scheme separator
+    """
+    i = url.find('://')
+    if i == -1:
+        return ''
+    return url[i + 3:].split('/', 1)[0].split('?', 1)[0].split('#', 1)[0]
 
 
 def extract_campaign_info(request):
@@ -169,8 +215,8 @@ def extract_campaign_info(request):
     # Parse referrer domain if available
     if referrer:
         try:
-            parsed = urlparse(referrer)
-            campaign_info['referrer_domain'] = parsed.netloc
+            # Fall back to urlparse only for referrers without a scheme
+            campaign_info['referrer_domain'] = _fast_netloc(referrer) or urlparse(referrer).netloc
         except Exception:
             pass
     
@@ -231,45 +277,36 @@ def check_analytics_consent(request):
         return False
     
     # Default: check settings for default consent behavior
-    default_consent = getattr(settings, 'ANALYTICS_REQUIRE_CONSENT', True)
-    return not default_consent  # If consent required, default is False
+    require_consent = _tracking_settings()[2]
+    return not require_consent  # If consent required, default is False
 
 
 def should_track_request(request):
     """
     Determine if request should be tracked
-    Checks various conditions:
-    - Analytics consent
+    Checks various conditions, cheapest first so excluded paths and bots
+    never touch cookies or the session backend:
     - Excluded paths
     - Bot detection
+    - Analytics consent
     - Admin/staff users (optional)
     """
-    # Check consent
-    if not check_analytics_consent(request):
-        return False
+    excluded_paths, exclude_staff, _ = _tracking_settings()
     
     # Check excluded paths
-    excluded_paths = getattr(settings, 'ANALYTICS_EXCLUDED_PATHS', [
-        '/admin/',
-        '/api/admin/',
-        '/static/',
-        '/media/',
-        '/favicon.ico',
-    ])
-    
-    path = request.path
-    for excluded in excluded_paths:
-        if path.startswith(excluded):
-            return False
+    if request.path.startswith(excluded_paths):
+        return False
     
     # Check if bot (simple detection)
     user_agent = request.META.get('HTTP_USER_AGENT', '').lower()
-    bot_keywords = ['bot', 'crawler', 'spider', 'scraper', 'monitor']
-    if any(keyword in user_agent for keyword in bot_keywords):
+    if any(keyword in user_agent for keyword in _BOT_KEYWORDS):
+        return False
+    
+    # Check consent (cookie + session lookup)
+    if not check_analytics_consent(request):
         return False
     
     # Check if admin/staff (optional)
-    exclude_staff = getattr(settings, 'ANALYTICS_EXCLUDE_STAFF', True)
     if exclude_staff and hasattr(request, 'user') and request.user.is_authenticated:
         if request.user.is_staff:
             return False
@@ -13,6 +13,11 @@ from .models import ContactSubmission
 from apps.integrations.email_service import EmailService
 
 
+STATUS_MAP = dict(ContactSubmission.STATUS_CHOICES)
+PRIORITY_MAP = dict(ContactSubmission.PRIORITY_CHOICES)
+CSV_EXPORT_CHUNK_SIZE = 1000
+
+
 class ContactSubmissionResource(resources.ModelResource):
     """Resource for import/export"""
     class Meta:
@@ -89,6 +94,7 @@ class ContactSubmissionAdmin(ImportExportModelAdmin):
     def status_badge(self, obj):
         """Display status with badge"""
         colors = {
+            'pending_spam_check': 'gray',
             'new': 'blue',
             'contacted': 'orange',
             'resolved': 'green',
@@ -146,7 +152,7 @@ class ContactSubmissionAdmin(ImportExportModelAdmin):
     def mark_as_contacted(self, request, queryset):
         """Mark selected submissions as contacted"""
         count = 0
-        for submission in queryset:
+        for submission in queryset.only('pk', 'site', 'status', 'contacted_at', 'updated_at'):
             submission.mark_as_contacted()
             count += 1
         self.message_user(request, f'{count} submissions marked as contacted.')
@@ -155,7 +161,7 @@ class ContactSubmissionAdmin(ImportExportModelAdmin):
     def mark_as_resolved(self, request, queryset):
         """Mark selected submissions as resolved"""
         count = 0
-        for submission in queryset:
+        for submission in queryset.only('pk', 'site', 'status', 'resolved_at', 'updated_at'):
             submission.mark_as_resolved()
             count += 1
         self.message_user(request, f'{count} submissions marked as resolved.')
@@ -182,18 +188,31 @@ class ContactSubmissionAdmin(ImportExportModelAdmin):
         writer.writerow(['Name', 'Email', 'Phone', 'Company', 'Subject', 'Message', 
                         'Status', 'Priority', 'Created At'])
         
-        for submission in queryset:
-            writer.writerow([
-                submission.name,
-                submission.email,
-                submission.phone or '',
-                submission.company or '',
-                submission.subject,
-                submission.message[:200],  # Truncate long messages
-                submission.get_status_display(),
-                submission.get_priority_display(),
-                submission.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-            ])
+        # Only fetch the exported columns instead of hydrating full model instances
+        rows = queryset.values_list(
+            'name', 'email', 'phone', 'company', 'subject', 'message',
+            'status', 'priority', 'created_at'
+        ).iterator(chunk_size=2000)
+        
+        # Buffer rows and flush with writerows to batch the C-level writes
+        buffer = []
+        for name, email, phone, company, subject, message, status, priority, created_at in rows:
+            buffer.append((
+                name,
+                email,
+                phone or '',
+                company or '',
+                subject,
+                message[:200],  # Truncate long messages
+                STATUS_MAP.get(status, status),
+                PRIORITY_MAP.get(priority, priority),
+                created_at.strftime('%Y-%m-%d %H:%M:%S'),
+            ))
+            if len(buffer) >= CSV_EXPORT_CHUNK_SIZE:
+                writer.writerows(buffer)
+                buffer.clear()
+        if buffer:
+            writer.writerows(buffer)
         
         return response
     export_to_csv.short_description = "Export to CSV"
@@ -202,13 +221,15 @@ class ContactSubmissionAdmin(ImportExportModelAdmin):
         """Send confirmation emails to selected submissions"""
         count = 0
         email_service = EmailService()
-        for submission in queryset:
-            if not submission.is_spam:
-                try:
-                    email_service.send_contact_confirmation(submission)
+        # Skip spam in the query and avoid loading message/user_agent/custom_data blobs
+        submissions = queryset.filter(is_spam=False).only('pk', 'email', 'name', 'subject')
+        # Sends are queued to Celery, so there is no SMTP connection to batch here
+        for submission in submissions:
+            try:
+                if email_service.send_contact_confirmation(submission):
                     count += 1
-                except Exception as e:
-                    self.message_user(request, f'Error sending email to {submission.email}: {str(e)}', level='error')
+            except Exception as e:
+                self.message_user(request, f'Error sending email to {submission.email}: {str(e)}', level='error')
         self.message_user(request, f'Confirmation emails sent to {count} submissions.')
     send_confirmation_emails.short_description = "Send confirmation emails"
     
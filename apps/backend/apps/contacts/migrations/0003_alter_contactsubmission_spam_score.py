@@ -0,0 +1,18 @@
+# Generated by Django 4.2.27 on 2026-10-16 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0002_contactsubmission_ab_test_name_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='contactsubmission',
+            name='spam_score',
+            field=models.FloatField(default=0.0),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.27 on 2026-10-16 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0003_alter_contactsubmission_spam_score'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='contactsubmission',
+            name='status',
+            field=models.CharField(choices=[('pending_spam_check', 'Pending Spam Check'), ('new', 'New'), ('contacted', 'Contacted'), ('resolved', 'Resolved'), ('archived', 'Archived')], default='new', max_length=20),
+        ),
+    ]
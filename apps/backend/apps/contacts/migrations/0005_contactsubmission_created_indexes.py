@@ -0,0 +1,21 @@
+# Generated by Django 4.2.27 on 2026-10-16 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0004_alter_contactsubmission_status'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contactsubmission',
+            index=models.Index(fields=['created_at'], name='contact_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactsubmission',
+            index=models.Index(fields=['is_spam', 'created_at'], name='contact_spam_created_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.27 on 2026-10-16 11:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0005_contactsubmission_created_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contactsubmission',
+            index=models.Index(condition=models.Q(('is_spam', False), ('status', 'new')), fields=['created_at'], name='contact_pending_idx'),
+        ),
+    ]
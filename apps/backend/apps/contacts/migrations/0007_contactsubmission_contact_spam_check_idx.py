@@ -0,0 +1,17 @@
+# Generated by Django 4.2.27 on 2026-10-16 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0006_contactsubmission_contact_pending_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contactsubmission',
+            index=models.Index(condition=models.Q(('status', 'pending_spam_check')), fields=['created_at'], name='contact_spam_check_idx'),
+        ),
+    ]
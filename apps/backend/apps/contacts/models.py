@@ -6,6 +6,7 @@ from apps.core.models import Site
 
 class ContactSubmission(models.Model):
     STATUS_CHOICES = [
+        ('pending_spam_check', 'Pending Spam Check'),
         ('new', 'New'),
         ('contacted', 'Contacted'),
         ('resolved', 'Resolved'),
@@ -55,7 +56,7 @@ class ContactSubmission(models.Model):
     ab_test_name = models.CharField(max_length=200, blank=True, null=True, help_text="Name of A/B test")
     
     is_spam = models.BooleanField(default=False)
-    spam_score = models.DecimalField(max_digits=5, decimal_places=2, default=0.0)
+    spam_score = models.FloatField(default=0.0)
     
     consent_given = models.BooleanField(default=False)
     consent_timestamp = models.DateTimeField(null=True, blank=True)
@@ -69,6 +70,12 @@ class ContactSubmission(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Contact Submission'
         verbose_name_plural = 'Contact Submissions'
+        indexes = [
+            models.Index(fields=['created_at'], name='contact_created_idx'),
+            models.Index(fields=['is_spam', 'created_at'], name='contact_spam_created_idx'),
+            models.Index(fields=['created_at'], name='contact_pending_idx', condition=models.Q(is_spam=False, status='new')),
+            models.Index(fields=['created_at'], name='contact_spam_check_idx', condition=models.Q(status='pending_spam_check')),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.subject}"
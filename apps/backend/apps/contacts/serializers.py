@@ -19,12 +19,6 @@ class ContactSubmissionCreateSerializer(serializers.ModelSerializer):
             'custom_data': {'required': False},
         }
     
-    def validate_email(self, value):
-        """Validate email format"""
-        if not value or '@' not in value:
-            raise serializers.ValidationError("Invalid email format.")
-        return value.lower().strip()
-    
     def validate_website(self, value):
         """Validate honeypot field - should be empty"""
         if value and value.strip():
@@ -53,9 +47,7 @@ class ContactSubmissionCreateSerializer(serializers.ModelSerializer):
         return sanitize_input(value.strip())
     
     def validate_email(self, value):
-        """Validate email and sanitize"""
-        if not value or '@' not in value:
-            raise serializers.ValidationError("Invalid email format.")
+        """Normalize and sanitize email (format is validated by the model's EmailField)"""
         return sanitize_input(value.lower().strip())
 
 
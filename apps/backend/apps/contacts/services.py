@@ -2,35 +2,161 @@
 Spam detection service for contact submissions
 """
 import re
+import logging
+from collections.abc import Sequence
+from functools import cached_property, lru_cache
 from django.conf import settings
+from django.dispatch import receiver
+from django.test.signals import setting_changed
 from django.utils import timezone
 from django_ratelimit.core import is_ratelimited
 from .security import verify_recaptcha
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    ahocorasick = None
+    AHOCORASICK_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+spam_logger = logging.getLogger('spam_detection')
+
+
+# Content-check patterns, compiled once at import time
+_LINK_RE = re.compile(r'https?://[^\s]+')
+_REPEAT_RE = re.compile(r'(.)\1{4,}')
+# Used with fullmatch; benchmarked faster than a hand-rolled set-based scan
+_EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+_LONG_REPEAT_RE = re.compile(r'(.)\1{10,}')
+
+_SPECIAL_CHARS = frozenset('!@#$%^&*()')
+
+# (reason, log) templates per check code, formatted only when read
+_SPAM_MESSAGES = {
+    'honeypot': ("Honeypot field filled", "Honeypot check failed: field contains '{0}'"),
+    'recaptcha_missing': ("Missing reCAPTCHA token", "reCAPTCHA token missing"),
+    'recaptcha_failed': ("reCAPTCHA verification failed: {0}", "reCAPTCHA verification failed: {0}"),
+    'recaptcha_low_score': ("Low reCAPTCHA score: {0}", "Low reCAPTCHA score: {0} (required: {1})"),
+    'rate_limit': ("Rate limit exceeded", "IP rate limit exceeded"),
+    'keyword': ("Suspicious keyword: {0}", "Found spam keyword: {0}"),
+    'links': ("Too many links: {0}", "Excessive links detected: {0}"),
+    'caps': ("Excessive capitalization", "High caps ratio: {0:.2f}"),
+    'repeat': ("Repeated characters detected", "Repetitive pattern found"),
+    'pattern': ("Suspicious pattern detected", "Suspicious pattern: {0}"),
+    'domain': ("Blacklisted email domain: {0}", "Blacklisted domain: {0}"),
+    'email': ("Blacklisted email address", "Blacklisted email: {0}"),
+    'email_format': ("Invalid email format", "Invalid email format"),
+    'short': ("Message too short", "Message too short: {0} chars"),
+}
+
+
+class _SpamMessages(Sequence):
+    """
+    Read-only list of reason or log lines for a snapshot of check hits
+    Formatted on first access and reused afterwards
+    """
+    
+    def __init__(self, hits, column):
+        self._hits = hits
+        self._column = column
+        self._messages = None
+    
+    def _formatted(self):
+        if self._messages is None:
+            column = self._column
+            self._messages = [_SPAM_MESSAGES[code][column].format(*args) for code, args in self._hits]
+        return self._messages
+    
+    def __getitem__(self, index):
+        return self._formatted()[index]
+    
+    def __len__(self):
+        # Length is known without formatting anything
+        return len(self._hits)
+    
+    def __eq__(self, other):
+        if isinstance(other, (_SpamMessages, list, tuple)):
+            return self._formatted() == list(other)
+        return NotImplemented
+    
+    def __repr__(self):
+        return repr(self._formatted())
+
+
+@lru_cache(maxsize=1)
+def get_recaptcha_config():
+    """
+    Read reCAPTCHA settings once instead of on every submission
+    Returns tuple of (secret_key, required_score)
+    """
+    return (
+        getattr(settings, 'RECAPTCHA_SECRET_KEY', None),
+        getattr(settings, 'RECAPTCHA_REQUIRED_SCORE', 0.5),
+    )
+
+
+@receiver(setting_changed)
+def _reset_recaptcha_config(setting, **kwargs):
+    """Drop cached reCAPTCHA settings when overridden (e.g. in tests)"""
+    if setting.startswith('RECAPTCHA_'):
+        get_recaptcha_config.cache_clear()
+
+
+class _CharClassTable(dict):
+    """
+    str.translate table mapping each character to its class:
+    'U' uppercase, 'D' digit, 'S' special character, '.' anything else
+    Classes are computed on first sight of a code point and cached
+    """
+    
+    def __missing__(self, codepoint):
+        char = chr(codepoint)
+        if char.isupper():
+            char_class = 'U'
+        elif char.isdecimal():
+            char_class = 'D'
+        elif char in _SPECIAL_CHARS:
+            char_class = 'S'
+        else:
+            char_class = '.'
+        self[codepoint] = char_class
+        return char_class
+
+
+_CHAR_CLASS_TABLE = _CharClassTable()
+# Pre-populate ASCII so typical messages never fall back to __missing__
+for _codepoint in range(128):
+    _CHAR_CLASS_TABLE[_codepoint]
+del _codepoint
+# bytes.translate equivalent for pure-ASCII messages, which skips the
+# per-character dict lookups of str.translate
+_ASCII_CLASS_BYTES = bytes(ord(_CHAR_CLASS_TABLE[i]) for i in range(128)) + b'.' * 128
+
 
 class CheckSubmissionSpam:
     """
     Service class for comprehensive spam detection
     """
     
-    # Suspicious keywords
-    SPAM_KEYWORDS = [
+    # Suspicious keywords (lowercase; tuple because matches are reported by index)
+    SPAM_KEYWORDS = (
         'viagra', 'casino', 'lottery', 'winner', 'click here', 'limited time',
         'act now', 'urgent', 'free money', 'guaranteed', 'no risk',
         'work from home', 'make money fast', 'get rich', 'debt consolidation',
         'weight loss', 'miracle cure', 'one weird trick', 'you won',
         'congratulations', 'claim now', 'exclusive offer', 'limited offer'
-    ]
+    )
     
-    # Blacklisted email domains
-    BLACKLISTED_DOMAINS = [
+    # Blacklisted email domains (tuple for the same reason)
+    BLACKLISTED_DOMAINS = (
         'tempmail', '10minutemail', 'guerrillamail', 'mailinator',
         'throwaway', 'trashmail', 'getnada', 'mohmal', 'yopmail',
         'fakeinbox', 'dispostable', 'maildrop'
-    ]
+    )
     
-    # Blacklisted email addresses (can be loaded from database or file)
-    BLACKLISTED_EMAILS = []
+    # Blacklisted email addresses (can be loaded from database or file; keep as frozenset)
+    BLACKLISTED_EMAILS = frozenset()
     
     # Link count threshold
     MAX_LINKS = 3
@@ -38,15 +164,89 @@ class CheckSubmissionSpam:
     # Caps ratio threshold
     CAPS_RATIO_THRESHOLD = 0.7
     
-    def __init__(self, submission_data, request=None):
+    def __init__(self, submission_data, request=None, ip_address=None, email_validated=False):
         """
         Initialize spam checker with submission data and optional request
+        ip_address is used for logging when no request is available (e.g. in a Celery task)
+        email_validated skips the email format check when the serializer already validated it
         """
         self.data = submission_data
         self.request = request
+        self.ip_address = ip_address
+        self.email_validated = email_validated
         self.spam_score = 0.0
-        self.reasons = []
-        self.logs = []
+        self._hits = []
+        self._messages = None
+    
+    # Derived message data, computed on first use and reused by every check.
+    # Request-only checks (honeypot, reCAPTCHA, rate limit) never pay for them.
+    
+    @cached_property
+    def _raw_message(self):
+        return self.data.get('message', '')
+    
+    @cached_property
+    def _message_length(self):
+        return len(self._raw_message)
+    
+    @cached_property
+    def _msg_lower(self):
+        return self._raw_message.lower()
+    
+    @cached_property
+    def _email_lower(self):
+        return self.data.get('email', '').lower()
+    
+    @cached_property
+    def _combined(self):
+        # NUL-separated so keyword matches cannot span two fields
+        return '\x00'.join((
+            self._msg_lower,
+            self.data.get('name', '').lower(),
+            self.data.get('subject', '').lower(),
+        ))
+    
+    @cached_property
+    def _link_count(self):
+        # subn counts matches in C without materializing a list of URLs
+        return _LINK_RE.subn('', self._msg_lower)[1]
+    
+    @cached_property
+    def _char_classes(self):
+        # Classify every character of the original message in one pass;
+        # caps, digit runs and special-character runs are read from it
+        raw_message = self._raw_message
+        if raw_message.isascii():
+            return raw_message.encode('ascii').translate(_ASCII_CLASS_BYTES).decode('ascii')
+        return raw_message.translate(_CHAR_CLASS_TABLE)
+    
+    def _flag(self, code, *args):
+        """
+        Record a failed check; message formatting is deferred to reasons/logs
+        """
+        self._hits.append((code, args))
+        self._messages = None
+    
+    def _get_messages(self):
+        """
+        (reasons, logs) for the hits so far, built once per set of hits
+        Both format lazily, so returning them from calculate_* costs nothing
+        until a caller reads the text
+        """
+        if self._messages is None:
+            hits = tuple(self._hits)
+            self._messages = (_SpamMessages(hits, 0), _SpamMessages(hits, 1))
+        return self._messages
+    
+    @property
+    def reasons(self):
+        """Human-readable reasons for each failed check"""
+        return self._get_messages()[0]
+    
+    @property
+    def logs(self):
+        """Detailed log lines for each failed check"""
+        return self._get_messages()[1]
     
     def check_honeypot(self, honeypot_value):
         """
@@ -55,8 +255,7 @@ class CheckSubmissionSpam:
         """
         if honeypot_value and honeypot_value.strip():
             self.spam_score += 1.0  # Immediate spam if honeypot filled
-            self.reasons.append("Honeypot field filled")
-            self.logs.append(f"Honeypot check failed: field contains '{honeypot_value[:20]}'")
+            self._flag('honeypot', honeypot_value[:20])
             return True, 1.0
         return False, 0.0
     
@@ -65,30 +264,26 @@ class CheckSubmissionSpam:
         Verify reCAPTCHA score
         Returns: (is_spam: bool, score: float)
         """
-        recaptcha_secret = getattr(settings, 'RECAPTCHA_SECRET_KEY', None)
+        recaptcha_secret, required_score = get_recaptcha_config()
         if not recaptcha_secret:
             # reCAPTCHA not configured, skip check
             return False, 0.0
         
         if not token:
             self.spam_score += 0.3
-            self.reasons.append("Missing reCAPTCHA token")
-            self.logs.append("reCAPTCHA token missing")
+            self._flag('recaptcha_missing')
             return False, 0.3
         
         success, score, error = verify_recaptcha(token, recaptcha_secret)
         
         if not success:
             self.spam_score += 0.5
-            self.reasons.append(f"reCAPTCHA verification failed: {error}")
-            self.logs.append(f"reCAPTCHA verification failed: {error}")
+            self._flag('recaptcha_failed', error)
             return True, 0.5
         
-        required_score = getattr(settings, 'RECAPTCHA_REQUIRED_SCORE', 0.5)
         if score < required_score:
             self.spam_score += (required_score - score) * 0.5
-            self.reasons.append(f"Low reCAPTCHA score: {score}")
-            self.logs.append(f"Low reCAPTCHA score: {score} (required: {required_score})")
+            self._flag('recaptcha_low_score', score, required_score)
             return score < 0.3, (required_score - score) * 0.5
         
         return False, 0.0
@@ -98,88 +293,118 @@ class CheckSubmissionSpam:
         Analyze message content for spam indicators
         Returns: (is_spam: bool, score: float)
         """
-        message = self.data.get('message', '').lower()
-        email = self.data.get('email', '').lower()
-        name = self.data.get('name', '').lower()
-        subject = self.data.get('subject', '').lower()
+        # Already at maximum penalty (e.g. honeypot filled), nothing left to add
+        if self.spam_score >= 1.0:
+            return True, 0.0
+        
+        message_length = self._message_length
+        message = self._msg_lower
+        email = self._email_lower
         
         content_score = 0.0
         
+        # Scan for spam keywords and blacklisted domains in one pass
+        keyword_hits, domain_hits = self._find_spam_terms(self._combined, email)
+        
         # Check for suspicious keywords
-        for keyword in self.SPAM_KEYWORDS:
-            if keyword in message or keyword in name or keyword in subject:
-                content_score += 0.15
-                self.reasons.append(f"Suspicious keyword: {keyword}")
-                self.logs.append(f"Found spam keyword: {keyword}")
+        for keyword in keyword_hits:
+            content_score += 0.15
+            self._flag('keyword', keyword)
+            if content_score > 1.0:
+                break
+        
+        # Maximum penalty reached, skip the remaining scans
+        if content_score > 1.0:
+            self.spam_score += content_score
+            return True, content_score
         
         # Check link count
-        link_pattern = r'https?://[^\s]+'
-        links = re.findall(link_pattern, message)
-        if len(links) > self.MAX_LINKS:
+        link_count = self._link_count
+        if link_count > self.MAX_LINKS:
             content_score += 0.2
-            self.reasons.append(f"Too many links: {len(links)}")
-            self.logs.append(f"Excessive links detected: {len(links)}")
+            self._flag('links', link_count)
+        
+        char_classes = self._char_classes
         
         # Check for ALL CAPS
-        if message and len(message) > 20:
-            caps_ratio = sum(1 for c in message if c.isupper()) / len(message)
+        if message_length > 20:
+            caps_ratio = char_classes.count('U') / message_length
             if caps_ratio > self.CAPS_RATIO_THRESHOLD:
                 content_score += 0.1
-                self.reasons.append("Excessive capitalization")
-                self.logs.append(f"High caps ratio: {caps_ratio:.2f}")
+                self._flag('caps', caps_ratio)
         
         # Check for repetitive patterns
-        if message:
-            repeated_pattern = r'(.)\1{4,}'
-            if re.search(repeated_pattern, message):
-                content_score += 0.1
-                self.reasons.append("Repeated characters detected")
-                self.logs.append("Repetitive pattern found")
+        has_repeat = bool(message) and _REPEAT_RE.search(message) is not None
+        if has_repeat:
+            content_score += 0.1
+            self._flag('repeat')
         
         # Check for suspicious patterns
-        spam_patterns = [
-            r'\d{4,}',  # Long number sequences
-            r'[!@#$%^&*()]{3,}',  # Multiple special characters
-            r'(.)\1{10,}',  # Very long repeated characters
-        ]
-        
-        for pattern in spam_patterns:
-            if re.search(pattern, message):
-                content_score += 0.1
-                self.reasons.append("Suspicious pattern detected")
-                self.logs.append(f"Suspicious pattern: {pattern}")
-                break
+        if 'DDDD' in char_classes:
+            suspicious_pattern = r'\d{4,}'  # Long number sequences
+        elif 'SSS' in char_classes:
+            suspicious_pattern = r'[!@#$%^&*()]{3,}'  # Multiple special characters
+        # A run of 11+ implies a run of 5+, so only rescan when one was found
+        elif has_repeat and _LONG_REPEAT_RE.search(message):
+            suspicious_pattern = _LONG_REPEAT_RE.pattern  # Very long repeated characters
+        else:
+            suspicious_pattern = None
+        
+        if suspicious_pattern:
+            content_score += 0.1
+            self._flag('pattern', suspicious_pattern)
         
         # Check email domain
-        for domain in self.BLACKLISTED_DOMAINS:
-            if domain in email:
-                content_score += 0.3
-                self.reasons.append(f"Blacklisted email domain: {domain}")
-                self.logs.append(f"Blacklisted domain: {domain}")
-                break
+        if domain_hits:
+            domain = domain_hits[0]
+            content_score += 0.3
+            self._flag('domain', domain)
         
         # Check blacklisted emails
         if email in self.BLACKLISTED_EMAILS:
             content_score += 1.0
-            self.reasons.append("Blacklisted email address")
-            self.logs.append(f"Blacklisted email: {email}")
+            self._flag('email', email)
         
         # Email format validation
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, email):
+        if not self.email_validated and not _EMAIL_RE.fullmatch(email):
             content_score += 0.2
-            self.reasons.append("Invalid email format")
-            self.logs.append("Invalid email format")
+            self._flag('email_format')
         
         # Very short messages
-        if len(message) < 15:
+        if message_length < 15:
             content_score += 0.1
-            self.reasons.append("Message too short")
-            self.logs.append(f"Message too short: {len(message)} chars")
+            self._flag('short', message_length)
         
         self.spam_score += content_score
         return content_score > 0.5, content_score
     
+    def _find_spam_terms(self, text, email):
+        """
+        Find spam keywords in text and blacklisted domains in email
+        Uses the shared Aho-Corasick automaton when pyahocorasick is installed
+        Returns: (keywords: list, domains: list) in declaration order
+        """
+        automaton = _get_spam_terms_automaton()
+        if automaton is None:
+            keywords = [keyword for keyword in self.SPAM_KEYWORDS if keyword in text]
+            domains = [domain for domain in self.BLACKLISTED_DOMAINS if domain in email]
+            return keywords, domains
+        
+        keyword_indexes = set()
+        domain_indexes = set()
+        email_start = len(text) + 1
+        for end, entries in automaton.iter(f'{text}\x00{email}'):
+            for kind, index, length in entries:
+                in_email = end - length + 1 >= email_start
+                if kind == 'keyword' and not in_email:
+                    keyword_indexes.add(index)
+                elif kind == 'domain' and in_email:
+                    domain_indexes.add(index)
+        
+        keywords = [self.SPAM_KEYWORDS[i] for i in sorted(keyword_indexes)]
+        domains = [self.BLACKLISTED_DOMAINS[i] for i in sorted(domain_indexes)]
+        return keywords, domains
+    
     def check_rate_limit(self):
         """
         Verify IP rate limit
@@ -190,8 +415,7 @@ class CheckSubmissionSpam:
         
         # Check if rate limited (5 per hour for forms)
         if is_ratelimited(self.request, group='contact-spam-check', key='ip', rate='5/h', method='POST', increment=False):
-            self.reasons.append("Rate limit exceeded")
-            self.logs.append("IP rate limit exceeded")
+            self._flag('rate_limit')
             return True
         return False
     
@@ -200,9 +424,21 @@ class CheckSubmissionSpam:
         Calculate comprehensive spam score
         Returns: (is_spam: bool, spam_score: float, reasons: list, logs: list)
         """
+        result = self.calculate_request_spam_score(honeypot_value, recaptcha_token)
+        if result[0]:
+            return result
+        return self.calculate_content_spam_score()
+    
+    def calculate_request_spam_score(self, honeypot_value=None, recaptcha_token=None):
+        """
+        Run the request-bound checks (honeypot, reCAPTCHA, rate limit)
+        These need the live request and must run inline; content checks are
+        left to calculate_content_spam_score
+        Returns: (is_spam: bool, spam_score: float, reasons: list, logs: list)
+        """
         self.spam_score = 0.0
-        self.reasons = []
-        self.logs = []
+        self._hits = []
+        self._messages = None
         
         # Check honeypot
         if honeypot_value is not None:
@@ -223,6 +459,18 @@ class CheckSubmissionSpam:
             # Rate limited = likely spam
             return True, 1.0, self.reasons, self.logs
         
+        return False, min(1.0, self.spam_score), self.reasons, self.logs
+    
+    def calculate_content_spam_score(self, base_score=None):
+        """
+        Run the content checks and produce the final verdict
+        Does not need the request, so it can run in a Celery worker
+        base_score: score carried over from calculate_request_spam_score
+        Returns: (is_spam: bool, spam_score: float, reasons: list, logs: list)
+        """
+        if base_score is not None:
+            self.spam_score = base_score
+        
         # Check content
         is_content_spam, content_score = self.check_content()
         
@@ -241,30 +489,112 @@ class CheckSubmissionSpam:
         Log spam attempt for analysis
         In production, this could write to a database or logging service
         """
-        import logging
-        logger = logging.getLogger('spam_detection')
+        # Skip building the payload when the record would be dropped
+        if not spam_logger.isEnabledFor(logging.WARNING):
+            return
         
         log_data = {
             'email': self.data.get('email', ''),
-            'ip_address': get_client_ip(self.request) if self.request else 'unknown',
+            'ip_address': get_client_ip(self.request) if self.request else (self.ip_address or 'unknown'),
             'spam_score': self.spam_score,
-            'reasons': self.reasons,
+            'reasons': list(self.reasons),
             'timestamp': str(timezone.now())
         }
         
-        logger.warning(f"Spam attempt detected: {log_data}")
+        spam_logger.warning("Spam attempt detected: %s", log_data)
+
+
+def process_clean_submission(submission):
+    """
+    Run the follow-ups for a submission that passed spam checks:
+    confirmation email, CRM sync, A/B test conversion and webhook
+    """
+    from apps.integrations.email_service import email_service
+    from apps.integrations.crm_service import crm_service
+    
+    # Send confirmation email
+    try:
+        email_service.send_contact_confirmation(submission)
+    except Exception as e:
+        logger.error(f"Failed to send confirmation email: {e}")
+    
+    # Sync to CRM (if configured)
+    try:
+        crm_service.sync_contact_submission(submission)
+    except Exception as e:
+        logger.error(f"Failed to sync to CRM: {e}")
+    
+    # Track A/B test conversion
+    if submission.ab_test_name and submission.ab_test_variant:
+        try:
+            from apps.ab_testing.services import ab_testing_service
+            ab_testing_service.track_conversion(
+                submission.ab_test_name,
+                submission.email,
+                submission,
+                conversion_type='contact_submission'
+            )
+        except Exception as e:
+            logger.error(f"Failed to track A/B test conversion: {e}")
+    
+    # Send webhook
+    try:
+        from apps.webhooks.services import webhook_service
+        webhook_service.send_webhook(
+            'contact_submission',
+            {
+                'id': str(submission.id),
+                'name': submission.name,
+                'email': submission.email,
+                'subject': submission.subject,
+                'status': submission.status,
+                'priority': submission.priority,
+                'ab_test_variant': submission.ab_test_variant,
+                'created_at': submission.created_at.isoformat(),
+            },
+            entity_id=str(submission.id)
+        )
+    except Exception as e:
+        logger.error(f"Failed to send webhook: {e}")
+
+
+def _build_spam_terms_automaton(keywords, domains):
+    """
+    Build an Aho-Corasick automaton over spam keywords and blacklisted domains
+    Returns None if pyahocorasick is not installed
+    """
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for kind, terms in (('keyword', keywords), ('domain', domains)):
+        for index, term in enumerate(terms):
+            # A term may be both a keyword and a domain, so keep every entry
+            entries = automaton.get(term, ())
+            automaton.add_word(term, entries + ((kind, index, len(term)),))
+    automaton.make_automaton()
+    return automaton
+
+
+@lru_cache(maxsize=1)
+def _get_spam_terms_automaton():
+    """
+    Shared spam terms automaton, built on first use and reused by every request
+    Read-only after make_automaton(), so a single instance is safe to share
+    """
+    return _build_spam_terms_automaton(
+        CheckSubmissionSpam.SPAM_KEYWORDS,
+        CheckSubmissionSpam.BLACKLISTED_DOMAINS,
+    )
 
 
 def get_client_ip(request):
     """Get client IP address from request"""
     if not request:
         return None
-    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-    if x_forwarded_for:
-        ip = x_forwarded_for.split(',')[0].strip()
-    else:
-        ip = request.META.get('REMOTE_ADDR')
-    return ip
+    meta = request.META
+    # Only the first hop matters, so stop splitting after it
+    return (meta.get('HTTP_X_FORWARDED_FOR') or meta.get('REMOTE_ADDR') or '').split(',', 1)[0].strip() or None
 
 
 
@@ -0,0 +1,89 @@
+"""
+Celery tasks for contact submissions
+"""
+from celery import shared_task
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3)
+def finalize_spam_check(self, submission_id):
+    """
+    Run content spam checks for a submission created as pending_spam_check,
+    then fire the clean-submission follow-ups (email, CRM, webhook)
+    Retried on failure; requeue_stale_spam_checks picks up anything still pending
+    """
+    from .models import ContactSubmission
+    from .services import CheckSubmissionSpam, process_clean_submission
+
+    try:
+        with transaction.atomic():
+            # Lock the row so a re-queued duplicate cannot finalize it twice
+            try:
+                submission = ContactSubmission.objects.select_for_update().get(
+                    pk=submission_id, status='pending_spam_check'
+                )
+            except ContactSubmission.DoesNotExist:
+                logger.warning(f"No pending spam check for contact submission {submission_id}")
+                return None
+
+            spam_checker = CheckSubmissionSpam(
+                {
+                    'name': submission.name,
+                    'email': submission.email,
+                    'subject': submission.subject,
+                    'message': submission.message,
+                },
+                ip_address=submission.ip_address,
+                # Email format was validated by the serializer before the submission was saved
+                email_validated=True
+            )
+            is_spam, spam_score, spam_reasons, spam_logs = spam_checker.calculate_content_spam_score(
+                base_score=submission.spam_score
+            )
+
+            submission.is_spam = is_spam
+            submission.spam_score = round(spam_score, 2)
+            submission.status = 'new'
+            if is_spam:
+                submission.consent_timestamp = None
+            submission.save(update_fields=['is_spam', 'spam_score', 'status', 'consent_timestamp', 'updated_at'])
+    except Exception as e:
+        logger.error(f"Spam check failed for contact submission {submission_id}: {str(e)}")
+        # Retry with exponential backoff
+        raise self.retry(exc=e, countdown=60 * (2 ** self.request.retries))
+
+    # Follow-ups handle their own errors; the submission is already released
+    if not is_spam:
+        process_clean_submission(submission)
+
+    return is_spam
+
+
+@shared_task
+def requeue_stale_spam_checks():
+    """
+    Re-queue submissions stuck in pending_spam_check, e.g. after a lost broker
+    message or a task that exhausted its retries
+    Should be run every few minutes via Celery Beat
+    """
+    from .models import ContactSubmission
+
+    cutoff = timezone.now() - timedelta(minutes=settings.CONTACT_SPAM_CHECK_STALE_MINUTES)
+    stale_ids = ContactSubmission.objects.filter(
+        status='pending_spam_check', created_at__lt=cutoff
+    ).values_list('pk', flat=True)
+
+    count = 0
+    for submission_id in stale_ids.iterator():
+        finalize_spam_check.delay(str(submission_id))
+        count += 1
+
+    if count:
+        logger.warning(f"Re-queued {count} stale contact spam checks")
+    return count
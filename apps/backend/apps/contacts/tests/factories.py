@@ -27,3 +27,8 @@ class ContactSubmissionFactory(factory.django.DjangoModelFactory):
     consent_given = True
     consent_timestamp = factory.LazyFunction(timezone.now)
 
+    
+    @classmethod
+    def bulk_build(cls, size, **kwargs):
+        """Build size submissions and insert them with a single bulk_create"""
+        return ContactSubmission.objects.bulk_create(cls.build_batch(size, **kwargs))
@@ -0,0 +1,36 @@
+"""
+Tests for contacts admin
+"""
+from unittest.mock import patch
+from django.contrib.admin.sites import AdminSite
+from django.test import TestCase, RequestFactory
+from apps.contacts.admin import ContactSubmissionAdmin
+from apps.contacts.models import ContactSubmission
+from apps.contacts.tests.factories import ContactSubmissionFactory
+from apps.core.models import Site
+
+
+class ContactSubmissionAdminTest(TestCase):
+    """Test ContactSubmissionAdmin actions"""
+
+    def setUp(self):
+        self.admin = ContactSubmissionAdmin(ContactSubmission, AdminSite())
+        self.request = RequestFactory().post('/admin/contacts/contactsubmission/')
+        site = Site.objects.create(name='alpha', domain='alpha.example.com', base_url='https://alpha.example.com')
+        ContactSubmissionFactory.create_batch(3, site=site)
+
+    @patch.object(ContactSubmissionAdmin, 'message_user')
+    def test_mark_as_contacted_query_count(self, mock_message_user):
+        """Test marking as contacted runs one SELECT plus one UPDATE per row"""
+        with self.assertNumQueries(4):
+            self.admin.mark_as_contacted(self.request, ContactSubmission.objects.all())
+
+        self.assertEqual(ContactSubmission.objects.filter(status='contacted').count(), 3)
+
+    @patch.object(ContactSubmissionAdmin, 'message_user')
+    def test_mark_as_resolved_query_count(self, mock_message_user):
+        """Test marking as resolved runs one SELECT plus one UPDATE per row"""
+        with self.assertNumQueries(4):
+            self.admin.mark_as_resolved(self.request, ContactSubmission.objects.all())
+
+        self.assertEqual(ContactSubmission.objects.filter(status='resolved').count(), 3)
@@ -63,7 +63,7 @@ class PermissionsTest(TestCase):
     
     def test_list_contacts_requires_auth(self):
         """Test listing contacts requires authentication"""
-        ContactSubmissionFactory.create_batch(3)
+        ContactSubmissionFactory.bulk_build(3)
         
         try:
             url = reverse('api:contact-list')
@@ -81,7 +81,7 @@ class PermissionsTest(TestCase):
     
     def test_list_contacts_admin_allowed(self):
         """Test admin can list contacts"""
-        ContactSubmissionFactory.create_batch(3)
+        ContactSubmissionFactory.bulk_build(3)
         
         try:
             url = reverse('api:contact-list')
@@ -51,6 +51,18 @@ class ContactSubmissionSerializerTest(TestCase):
         self.assertFalse(serializer.is_valid())
         self.assertIn('email', serializer.errors)
     
+    def test_create_serializer_email_normalized(self):
+        """Test serializer lowercases email"""
+        data = {
+            'name': 'John Doe',
+            'email': 'John@Example.COM',
+            'subject': 'Test Subject',
+            'message': 'This is a test message'
+        }
+        serializer = ContactSubmissionCreateSerializer(data=data)
+        self.assertTrue(serializer.is_valid())
+        self.assertEqual(serializer.validated_data['email'], 'john@example.com')
+    
     def test_create_serializer_message_too_short(self):
         """Test serializer with message too short"""
         data = {
@@ -2,9 +2,9 @@
 Tests for ContactSubmission services
 """
 from unittest.mock import patch, MagicMock
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from apps.contacts.models import ContactSubmission
-from apps.contacts.services import CheckSubmissionSpam
+from apps.contacts.services import CheckSubmissionSpam, get_client_ip
 from apps.contacts.tests.factories import ContactSubmissionFactory
 
 
@@ -114,3 +114,128 @@ class SpamDetectionServiceTest(TestCase):
         self.assertTrue(is_spam)
         self.assertGreater(score, 0.7)
 
+    
+    def test_find_spam_terms(self):
+        """Test keyword and blacklisted domain matching"""
+        checker = CheckSubmissionSpam({}, self.request)
+        keywords, domains = checker._find_spam_terms(
+            'claim now\x00casino king\x00tempmail question', 'user@yopmail.com'
+        )
+        self.assertEqual(keywords, ['casino', 'claim now'])
+        self.assertEqual(domains, ['yopmail'])
+    
+    def test_find_spam_terms_without_automaton(self):
+        """Test pure-Python fallback matches the automaton"""
+        checker = CheckSubmissionSpam({}, self.request)
+        text = 'you won a free money lottery\x00Winner\x00act now'
+        with patch('apps.contacts.services._get_spam_terms_automaton', return_value=None):
+            fallback = checker._find_spam_terms(text, 'a@mailinator.com')
+        self.assertEqual(fallback, checker._find_spam_terms(text, 'a@mailinator.com'))
+    
+    def test_check_content_caps_and_patterns(self):
+        """Test caps ratio and suspicious pattern detection"""
+        data = {
+            'name': 'Test',
+            'email': 'test@example.com',
+            'message': 'PLEASE CALL ME BACK ABOUT THE ORDER 12345'
+        }
+        checker = CheckSubmissionSpam(data, self.request)
+        checker.check_content()
+        self.assertIn("Excessive capitalization", checker.reasons)
+        self.assertIn("Suspicious pattern: \\d{4,}", checker.logs)
+    
+    def test_check_content_special_characters(self):
+        """Test special character runs are flagged"""
+        data = {
+            'name': 'Test',
+            'email': 'test@example.com',
+            'message': 'Hello there, this is great!!! really'
+        }
+        checker = CheckSubmissionSpam(data, self.request)
+        checker.check_content()
+        self.assertIn("Suspicious pattern: [!@#$%^&*()]{3,}", checker.logs)
+        self.assertNotIn("Excessive capitalization", checker.reasons)
+    
+    def test_check_content_skipped_after_honeypot(self):
+        """Test content scan is skipped once maximum penalty is reached"""
+        data = {'name': 'Test', 'email': 'test@example.com', 'message': 'Test'}
+        checker = CheckSubmissionSpam(data, self.request)
+        checker.check_honeypot('filled')
+        is_spam, score = checker.check_content()
+        self.assertTrue(is_spam)
+        self.assertEqual(score, 0.0)
+        self.assertEqual(checker.reasons, ["Honeypot field filled"])
+
+    def test_reasons_formatted_lazily_once(self):
+        """Test reasons/logs are only formatted when read, and only once"""
+        data = {'name': 'Test', 'email': 'test@example.com', 'message': 'Test'}
+        checker = CheckSubmissionSpam(data, self.request)
+        is_spam, score, reasons, logs = checker.calculate_request_spam_score(honeypot_value='filled')
+        self.assertTrue(is_spam)
+        self.assertEqual(len(reasons), 1)
+        self.assertIsNone(reasons._messages)
+
+        self.assertIs(checker.reasons, reasons)
+        self.assertEqual(reasons, ["Honeypot field filled"])
+        self.assertIs(reasons[0], checker.reasons[0])
+        self.assertEqual(logs, ["Honeypot check failed: field contains 'filled'"])
+
+    def test_check_content_invalid_email_format(self):
+        """Test malformed emails are penalized"""
+        for email in ('bad@@example.com', 'user@example', 'user@example.com\n'):
+            data = {'name': 'Test', 'email': email, 'message': 'A perfectly normal message'}
+            checker = CheckSubmissionSpam(data, self.request)
+            checker.check_content()
+            self.assertIn("Invalid email format", checker.reasons, email)
+    
+    @override_settings(RECAPTCHA_SECRET_KEY='secret', RECAPTCHA_REQUIRED_SCORE=0.5)
+    @patch('apps.contacts.services.verify_recaptcha')
+    def test_check_recaptcha_low_score(self, mock_verify):
+        """Test reCAPTCHA check picks up overridden settings"""
+        mock_verify.return_value = (True, 0.1, None)
+        data = {'name': 'Test', 'email': 'test@example.com', 'message': 'Test'}
+        checker = CheckSubmissionSpam(data, self.request)
+        is_spam, score = checker.check_recaptcha('token')
+        mock_verify.assert_called_once_with('token', 'secret')
+        self.assertTrue(is_spam)
+        self.assertAlmostEqual(score, 0.2)
+    
+    def test_get_client_ip(self):
+        """Test client IP is taken from the first forwarded hop"""
+        request = self.factory.get('/', HTTP_X_FORWARDED_FOR=' 203.0.113.7 , 10.0.0.1, 10.0.0.2')
+        self.assertEqual(get_client_ip(request), '203.0.113.7')
+        request = self.factory.get('/', REMOTE_ADDR='198.51.100.1')
+        self.assertEqual(get_client_ip(request), '198.51.100.1')
+        request = self.factory.get('/', REMOTE_ADDR='')
+        self.assertIsNone(get_client_ip(request))
+        self.assertIsNone(get_client_ip(None))
+    
+    def test_log_spam_attempt(self):
+        """Test spam attempts are logged to the spam_detection logger"""
+        data = {'name': 'Test', 'email': 'spam@example.com', 'message': 'Test'}
+        checker = CheckSubmissionSpam(data, self.request)
+        with self.assertLogs('spam_detection', level='WARNING') as logs:
+            checker._log_spam_attempt()
+        self.assertIn('spam@example.com', logs.output[0])
+    
+    def test_check_content_long_repeat(self):
+        """Test very long character runs are flagged as suspicious"""
+        data = {'name': 'Test', 'email': 'test@example.com', 'message': 'Hello there, aaaaaaaaaaaaaaa'}
+        checker = CheckSubmissionSpam(data, self.request)
+        checker.check_content()
+        self.assertIn("Repeated characters detected", checker.reasons)
+        self.assertIn("Suspicious pattern detected", checker.reasons)
+    
+    def test_check_content_non_ascii_caps(self):
+        """Test capitalization is detected in non-ASCII messages"""
+        data = {'name': 'Test', 'email': 'test@example.com', 'message': 'ÉCOUTEZ MOI BIEN, ÇA EST TRÈS IMPORTANT'}
+        checker = CheckSubmissionSpam(data, self.request)
+        checker.check_content()
+        self.assertIn("Excessive capitalization", checker.reasons)
+    
+    def test_check_content_email_validated(self):
+        """Test email format check is skipped for serializer-validated emails"""
+        data = {'name': 'Test', 'email': 'user@example', 'message': 'A perfectly normal message'}
+        checker = CheckSubmissionSpam(data, self.request, email_validated=True)
+        checker.check_content()
+        self.assertNotIn("Invalid email format", checker.reasons)
@@ -0,0 +1,93 @@
+"""
+Tests for ContactSubmission Celery tasks
+"""
+from datetime import timedelta
+from unittest.mock import patch
+from celery.exceptions import Retry
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from apps.contacts.models import ContactSubmission
+from apps.contacts.tasks import finalize_spam_check, requeue_stale_spam_checks
+from apps.contacts.tests.factories import ContactSubmissionFactory
+
+
+class FinalizeSpamCheckTaskTest(TestCase):
+    """Test finalize_spam_check task"""
+
+    @patch('apps.contacts.services.process_clean_submission')
+    def test_clean_submission(self, mock_process):
+        """Test clean submission is released and follow-ups run"""
+        submission = ContactSubmissionFactory(
+            status='pending_spam_check',
+            email='john@example.com',
+            message='Hello, I am interested in your product. Can you provide more information?'
+        )
+
+        is_spam = finalize_spam_check(str(submission.id))
+
+        submission.refresh_from_db()
+        self.assertFalse(is_spam)
+        self.assertFalse(submission.is_spam)
+        self.assertEqual(submission.status, 'new')
+        mock_process.assert_called_once()
+
+    @patch('apps.contacts.services.process_clean_submission')
+    def test_spam_submission(self, mock_process):
+        """Test spam submission is flagged and follow-ups are skipped"""
+        submission = ContactSubmissionFactory(
+            status='pending_spam_check',
+            email='winner@mailinator.com',
+            spam_score=0.3,
+            message='You won the lottery! Claim now, free money guaranteed http://a.com http://b.com http://c.com http://d.com'
+        )
+
+        is_spam = finalize_spam_check(str(submission.id))
+
+        submission.refresh_from_db()
+        self.assertTrue(is_spam)
+        self.assertTrue(submission.is_spam)
+        self.assertIsNone(submission.consent_timestamp)
+        mock_process.assert_not_called()
+
+    @patch('apps.contacts.services.process_clean_submission')
+    def test_already_finalized(self, mock_process):
+        """Test submissions no longer pending are ignored"""
+        submission = ContactSubmissionFactory(status='new')
+
+        self.assertIsNone(finalize_spam_check(str(submission.id)))
+        mock_process.assert_not_called()
+
+    @patch('apps.contacts.services.process_clean_submission')
+    @patch('apps.contacts.services.CheckSubmissionSpam.calculate_content_spam_score')
+    def test_failure_retries(self, mock_score, mock_process):
+        """Test a failed check is retried and the submission stays pending"""
+        mock_score.side_effect = RuntimeError('database went away')
+        submission = ContactSubmissionFactory(status='pending_spam_check')
+
+        with patch.object(finalize_spam_check, 'retry', side_effect=Retry()) as mock_retry:
+            with self.assertRaises(Retry):
+                finalize_spam_check(str(submission.id))
+
+        mock_retry.assert_called_once()
+        self.assertIsInstance(mock_retry.call_args.kwargs['exc'], RuntimeError)
+        submission.refresh_from_db()
+        self.assertEqual(submission.status, 'pending_spam_check')
+        mock_process.assert_not_called()
+
+
+@override_settings(CONTACT_SPAM_CHECK_STALE_MINUTES=5)
+class RequeueStaleSpamChecksTaskTest(TestCase):
+    """Test requeue_stale_spam_checks task"""
+
+    @patch('apps.contacts.tasks.finalize_spam_check.delay')
+    def test_requeues_only_stale_pending(self, mock_delay):
+        """Test only submissions pending past the cutoff are re-queued"""
+        stale = ContactSubmissionFactory(status='pending_spam_check')
+        ContactSubmissionFactory(status='pending_spam_check')
+        old_finalized = ContactSubmissionFactory(status='new')
+        ContactSubmission.objects.filter(pk__in=[stale.pk, old_finalized.pk]).update(
+            created_at=timezone.now() - timedelta(minutes=10)
+        )
+
+        self.assertEqual(requeue_stale_spam_checks(), 1)
+        mock_delay.assert_called_once_with(str(stale.id))
@@ -10,7 +10,6 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
 from rest_framework.throttling import UserRateThrottle, AnonRateThrottle
 from django_ratelimit.core import is_ratelimited
-from django.conf import settings
 from .models import ContactSubmission
 from .serializers import (
     ContactSubmissionCreateSerializer,
@@ -18,10 +17,12 @@ from .serializers import (
     ContactSubmissionUpdateSerializer
 )
 from .security import detect_spam, verify_recaptcha
-from .services import CheckSubmissionSpam
-from apps.integrations.email_service import email_service
-from apps.integrations.crm_service import crm_service
+from .services import CheckSubmissionSpam, get_recaptcha_config
+from .tasks import finalize_spam_check
 from apps.integrations.i18n_utils import get_user_language, activate_language
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class ContactSubmissionViewSet(viewsets.ModelViewSet):
@@ -58,10 +59,10 @@ class ContactSubmissionViewSet(viewsets.ModelViewSet):
         if date_to:
             queryset = queryset.filter(created_at__lte=date_to)
         
-        # Filter out spam by default (unless explicitly requested)
+        # Filter out spam and submissions still awaiting spam checks by default (unless explicitly requested)
         exclude_spam = self.request.query_params.get('include_spam', 'false').lower() != 'true'
         if exclude_spam:
-            queryset = queryset.filter(is_spam=False)
+            queryset = queryset.filter(is_spam=False).exclude(status='pending_spam_check')
         
         return queryset
     
@@ -167,7 +168,7 @@ def submit_contact_form(request):
             )
         
         # Verify reCAPTCHA if enabled
-        recaptcha_secret = getattr(settings, 'RECAPTCHA_SECRET_KEY', None)
+        recaptcha_secret, _ = get_recaptcha_config()
         if recaptcha_secret:
             success, score, error = verify_recaptcha(recaptcha_token, recaptcha_secret)
             if not success:
@@ -188,9 +189,23 @@ def submit_contact_form(request):
         from apps.core.utils import get_site_from_request
         site = get_site_from_request(request)
         
-        # Enhanced spam detection using service
+        # Get A/B test info
+        ab_test_name = serializer.validated_data.pop('ab_test_name', None)
+        ab_test_variant = None
+        
+        # If A/B test name provided, get or assign variant
+        if ab_test_name:
+            try:
+                from apps.ab_testing.services import ABTestingService
+                user_identifier = serializer.validated_data.get('email') or request.session.session_key or 'anonymous'
+                ab_test_variant = ABTestingService.get_variant(ab_test_name, user_identifier)
+            except Exception as e:
+                logger.error(f"Failed to get A/B test variant: {e}")
+                ab_test_name = None
+        
+        # Request-bound spam checks run inline; content checks run in a Celery task
         spam_checker = CheckSubmissionSpam(serializer.validated_data, request)
-        is_spam, spam_score, spam_reasons, spam_logs = spam_checker.calculate_spam_score(
+        is_spam, spam_score, spam_reasons, spam_logs = spam_checker.calculate_request_spam_score(
             honeypot_value=honeypot_value,
             recaptcha_token=recaptcha_token
         )
@@ -202,61 +217,27 @@ def submit_contact_form(request):
             ip_address=ip_address,
             user_agent=user_agent,
             referrer=referrer,
-            spam_score=spam_score,
+            spam_score=round(spam_score, 2),
             is_spam=is_spam,
+            status='new' if is_spam else 'pending_spam_check',
             ab_test_name=ab_test_name,
             ab_test_variant=ab_test_variant,
             consent_given=True,  # Assuming consent given if form submitted
             consent_timestamp=timezone.now() if not is_spam else None
         )
         
-        # Send confirmation email (only if not spam)
-        if not is_spam:
-            try:
-                email_service.send_contact_confirmation(submission)
-            except Exception as e:
-                logger.error(f"Failed to send confirmation email: {e}")
-        
-        # Sync to CRM (only if not spam and CRM configured)
+        # Finish spam detection (and email/CRM/webhook follow-ups) off the request path
         if not is_spam:
             try:
-                crm_service.sync_contact_submission(submission)
+                finalize_spam_check.delay(str(submission.id))
             except Exception as e:
-                logger.error(f"Failed to sync to CRM: {e}")
-            
-            # Track A/B test conversion
-            if ab_test_name and ab_test_variant:
+                logger.warning(f"Failed to queue spam check, running inline: {e}")
                 try:
-                    from apps.ab_testing.services import ab_testing_service
-                    user_identifier = submission.email or request.session.session_key or 'anonymous'
-                    ab_testing_service.track_conversion(
-                        ab_test_name,
-                        user_identifier,
-                        submission,
-                        conversion_type='contact_submission'
-                    )
+                    finalize_spam_check(str(submission.id))
                 except Exception as e:
-                    logger.error(f"Failed to track A/B test conversion: {e}")
-            
-            # Send webhook (only if not spam)
-            try:
-                from apps.webhooks.services import webhook_service
-                webhook_service.send_webhook(
-                    'contact_submission',
-                    {
-                        'id': str(submission.id),
-                        'name': submission.name,
-                        'email': submission.email,
-                        'subject': submission.subject,
-                        'status': submission.status,
-                        'priority': submission.priority,
-                        'ab_test_variant': ab_test_variant,
-                        'created_at': submission.created_at.isoformat(),
-                    },
-                    entity_id=str(submission.id)
-                )
-            except Exception as e:
-                logger.error(f"Failed to send webhook: {e}")
+                    # The submission is saved; requeue_stale_spam_checks finishes it later.
+                    # Failing the request here would only invite a duplicate resubmission
+                    logger.error(f"Inline spam check failed for {submission.id}: {e}")
         
         # Return success response
         return Response({
@@ -285,7 +266,7 @@ def get_client_ip(request):
 @login_required
 def contact_list(request):
     """Display list of all contact submissions"""
-    contacts = ContactSubmission.objects.filter(is_spam=False)
+    contacts = ContactSubmission.objects.filter(is_spam=False).exclude(status='pending_spam_check')
     
     # Search functionality
     search_query = request.GET.get('search', '')
@@ -4,8 +4,12 @@ API views for core dashboard functionality
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
 from django.utils import timezone
 from django.db.models import Count, Avg, Q
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 
 from apps.contacts.models import ContactSubmission
@@ -13,6 +17,40 @@ from apps.waitlist.models import WaitlistEntry
 from apps.leads.models import Lead
 from apps.newsletter.models import NewsletterSubscription
 
+# Cache keys (invalidated by apps.core.signals when tracked models change)
+CACHE_KEY_DASHBOARD_STATS = 'dashboard_stats_{}'  # {site id or 'all'}
+DASHBOARD_STATS_CACHE_TIMEOUT = 120  # 2 minutes
+
+
+def _aggregate_in_thread(queryset, aggregates):
+    """
+    Run one aggregate query on a pool thread
+    Django connections are per thread, so close this thread's connection when done
+    """
+    try:
+        return queryset.aggregate(**aggregates)
+    finally:
+        connection.close()
+
+
+def _run_aggregates(jobs):
+    """
+    Run independent aggregate queries, concurrently when DASHBOARD_STATS_PARALLEL is enabled
+    Each pool thread opens its own DB connection, so only enable it when
+    connections are cheap to open (e.g. behind a connection pooler)
+    jobs: dict of name -> (queryset, aggregate kwargs)
+    Returns: dict of name -> aggregate result
+    """
+    if not getattr(settings, 'DASHBOARD_STATS_PARALLEL', False):
+        return {name: queryset.aggregate(**aggregates) for name, (queryset, aggregates) in jobs.items()}
+    
+    with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+        futures = {
+            name: executor.submit(_aggregate_in_thread, queryset, aggregates)
+            for name, (queryset, aggregates) in jobs.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
+
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated, IsAdminUser])
@@ -24,116 +62,139 @@ def dashboard_stats(request):
     Query Parameters:
     - site: Filter by site name or ID (optional)
     """
-    from apps.core.models import Site
-    from apps.core.utils import get_site_from_request
+    from apps.core.utils import get_site_by_identifier
     
     # Get site filter from query params or request
     site_filter = request.query_params.get('site', None)
     site = None
     
     if site_filter:
-        # Try to get site by name or ID
-        try:
-            # Try UUID first
-            site = Site.objects.get(id=site_filter, is_active=True)
-        except (Site.DoesNotExist, ValueError):
-            # Try by name
-            try:
-                site = Site.objects.get(name=site_filter, is_active=True)
-            except Site.DoesNotExist:
-                pass
-    
-    # Base queryset filter
-    site_filter_q = Q()
-    if site:
-        site_filter_q = Q(site=site)
-    
-    now = timezone.now()
-    week_ago = now - timedelta(days=7)
-    month_ago = now - timedelta(days=30)
+        # Try to get site by ID or name
+        site = get_site_by_identifier(site_filter)
+    
+    cache_key = CACHE_KEY_DASHBOARD_STATS.format(site.id if site else 'all')
+    cached_stats = cache.get(cache_key)
+    if cached_stats is not None:
+        return Response(cached_stats, status=200)
+    
+    # Base filter kwargs, merged into each model's single filter() call
+    site_kwargs = {'site': site} if site else {}
+    
+    # Day boundaries as datetimes so created_at comparisons can use its index
+    # (a __date lookup wraps the column in a DATE() cast)
+    today_start = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+    week_ago = today_start - timedelta(days=7)
+    month_ago = today_start - timedelta(days=30)
     last_month_start = month_ago - timedelta(days=30)
     
+    use_rollup = getattr(settings, 'DASHBOARD_STATS_USE_ROLLUP', False)
+    if use_rollup:
+        # Completed days come from the nightly rollup; only today is counted live
+        this_month = Q(created_at__gte=today_start)
+    else:
+        this_month = Q(created_at__gte=month_ago)
+    last_month = Q(created_at__gte=last_month_start, created_at__lt=month_ago)
+    
+    subscribed = Q(subscription_status='subscribed')
+    
+    # One conditional-aggregate query per model instead of one COUNT per stat;
+    # the four queries are independent and may run concurrently
+    jobs = {
+        # Submissions awaiting their spam check are left out, as in the contact lists
+        'contacts': (ContactSubmission.objects.filter(is_spam=False, **site_kwargs).exclude(status='pending_spam_check'), {
+            'total': Count('id'),
+            'new': Count('id', filter=Q(created_at__gte=week_ago)),
+            'pending': Count('id', filter=Q(status='new')),
+            'this_month': Count('id', filter=this_month),
+            'last_month': Count('id', filter=last_month),
+        }),
+        'waitlist': (WaitlistEntry.objects.filter(**site_kwargs), {
+            'total': Count('id'),
+            'pending': Count('id', filter=Q(status='pending')),
+            'avg_score': Avg('priority_score'),
+            'this_month': Count('id', filter=this_month),
+            'last_month': Count('id', filter=last_month),
+        }),
+        'leads': (Lead.objects.filter(**site_kwargs), {
+            'total': Count('id'),
+            'qualified': Count('id', filter=Q(status='qualified')),
+            'converted': Count('id', filter=Q(status='converted')),
+            'this_month': Count('id', filter=this_month),
+            'last_month': Count('id', filter=last_month),
+        }),
+        'newsletter': (NewsletterSubscription.objects.filter(**site_kwargs), {
+            'total': Count('id'),
+            'active': Count('id', filter=subscribed),
+            'unsubscribed': Count('id', filter=Q(subscription_status='unsubscribed')),
+            'this_month': Count('id', filter=subscribed & this_month),
+            'last_month': Count('id', filter=subscribed & last_month),
+        }),
+    }
+    if use_rollup:
+        for _, aggregates in jobs.values():
+            del aggregates['last_month']
+    results = _run_aggregates(jobs)
+    
+    if use_rollup:
+        from apps.core.services import get_rollup_trend_counts
+        trend_counts = get_rollup_trend_counts(
+            site_kwargs, last_month_start.date(), month_ago.date(), today_start.date()
+        )
+        for name, (this_month_count, last_month_count) in trend_counts.items():
+            results[name]['this_month'] += this_month_count
+            results[name]['last_month'] = last_month_count
+    
     # Contacts stats
-    total_contacts = ContactSubmission.objects.filter(is_spam=False).filter(site_filter_q).count()
-    new_contacts = ContactSubmission.objects.filter(
-        is_spam=False,
-        created_at__date__gte=week_ago.date()
-    ).filter(site_filter_q).count()
-    pending_contacts = ContactSubmission.objects.filter(
-        is_spam=False,
-        status='new'
-    ).filter(site_filter_q).count()
+    contacts = results['contacts']
+    total_contacts = contacts['total']
+    new_contacts = contacts['new']
+    pending_contacts = contacts['pending']
     
     # Calculate contacts trend (this month vs last month)
-    this_month_contacts = ContactSubmission.objects.filter(
-        is_spam=False,
-        created_at__date__gte=month_ago.date()
-    ).filter(site_filter_q).count()
-    last_month_contacts = ContactSubmission.objects.filter(
-        is_spam=False,
-        created_at__date__gte=last_month_start.date(),
-        created_at__date__lt=month_ago.date()
-    ).filter(site_filter_q).count()
+    this_month_contacts = contacts['this_month']
+    last_month_contacts = contacts['last_month']
     contacts_trend = 0
     if last_month_contacts > 0:
         contacts_trend = round(((this_month_contacts - last_month_contacts) / last_month_contacts) * 100, 1)
     
     # Waitlist stats
-    total_waitlist = WaitlistEntry.objects.filter(site_filter_q).count()
-    pending_waitlist = WaitlistEntry.objects.filter(status='pending').filter(site_filter_q).count()
-    avg_score = WaitlistEntry.objects.filter(site_filter_q).aggregate(avg=Avg('priority_score'))['avg'] or 0
+    waitlist = results['waitlist']
+    total_waitlist = waitlist['total']
+    pending_waitlist = waitlist['pending']
+    avg_score = waitlist['avg_score'] or 0
     
     # Calculate waitlist trend
-    this_month_waitlist = WaitlistEntry.objects.filter(
-        created_at__date__gte=month_ago.date()
-    ).filter(site_filter_q).count()
-    last_month_waitlist = WaitlistEntry.objects.filter(
-        created_at__date__gte=last_month_start.date(),
-        created_at__date__lt=month_ago.date()
-    ).filter(site_filter_q).count()
+    this_month_waitlist = waitlist['this_month']
+    last_month_waitlist = waitlist['last_month']
     waitlist_trend = 0
     if last_month_waitlist > 0:
         waitlist_trend = round(((this_month_waitlist - last_month_waitlist) / last_month_waitlist) * 100, 1)
     
     # Leads stats
-    total_leads = Lead.objects.filter(site_filter_q).count()
-    qualified_leads = Lead.objects.filter(status='qualified').filter(site_filter_q).count()
-    converted_leads = Lead.objects.filter(status='converted').filter(site_filter_q).count()
+    leads = results['leads']
+    total_leads = leads['total']
+    qualified_leads = leads['qualified']
+    converted_leads = leads['converted']
     conversion_rate = 0
     if total_leads > 0:
         conversion_rate = round((converted_leads / total_leads) * 100, 1)
     
     # Calculate leads trend
-    this_month_leads = Lead.objects.filter(
-        created_at__date__gte=month_ago.date()
-    ).filter(site_filter_q).count()
-    last_month_leads = Lead.objects.filter(
-        created_at__date__gte=last_month_start.date(),
-        created_at__date__lt=month_ago.date()
-    ).filter(site_filter_q).count()
+    this_month_leads = leads['this_month']
+    last_month_leads = leads['last_month']
     leads_trend = 0
     if last_month_leads > 0:
         leads_trend = round(((this_month_leads - last_month_leads) / last_month_leads) * 100, 1)
     
     # Newsletter stats
-    total_newsletter = NewsletterSubscription.objects.filter(site_filter_q).count()
-    active_newsletter = NewsletterSubscription.objects.filter(
-        subscription_status='subscribed'
-    ).filter(site_filter_q).count()
-    unsubscribed_newsletter = NewsletterSubscription.objects.filter(
-        subscription_status='unsubscribed'
-    ).filter(site_filter_q).count()
+    newsletter = results['newsletter']
+    total_newsletter = newsletter['total']
+    active_newsletter = newsletter['active']
+    unsubscribed_newsletter = newsletter['unsubscribed']
     
     # Calculate newsletter growth rate
-    this_month_newsletter = NewsletterSubscription.objects.filter(
-        subscription_status='subscribed',
-        created_at__date__gte=month_ago.date()
-    ).filter(site_filter_q).count()
-    last_month_newsletter = NewsletterSubscription.objects.filter(
-        subscription_status='subscribed',
-        created_at__date__gte=last_month_start.date(),
-        created_at__date__lt=month_ago.date()
-    ).filter(site_filter_q).count()
+    this_month_newsletter = newsletter['this_month']
+    last_month_newsletter = newsletter['last_month']
     newsletter_growth_rate = 0
     if last_month_newsletter > 0:
         newsletter_growth_rate = round(((this_month_newsletter - last_month_newsletter) / last_month_newsletter) * 100, 1)
@@ -174,5 +235,7 @@ def dashboard_stats(request):
             'display_name': site.display_name,
         }
     
+    cache.set(cache_key, response_data, DASHBOARD_STATS_CACHE_TIMEOUT)
+    
     return Response(response_data, status=200)
 
@@ -0,0 +1,31 @@
+"""
+Management command to backfill the SiteDailyStats rollup
+"""
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.core.services import refresh_daily_stats
+
+
+class Command(BaseCommand):
+    help = 'Rebuild SiteDailyStats rows for past days (run before enabling DASHBOARD_STATS_USE_ROLLUP)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=60,
+            help='Number of past days to rebuild, excluding today (default: 60)'
+        )
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        total_rows = 0
+        
+        for offset in range(options['days'], 0, -1):
+            total_rows += refresh_daily_stats(today - timedelta(days=offset))
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"Backfilled {options['days']} days of daily stats ({total_rows} rows)"
+        ))
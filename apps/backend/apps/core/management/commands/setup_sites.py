@@ -2,7 +2,9 @@
 Management command to set up default sites
 """
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from apps.core.models import Site
+from apps.core.utils import clear_site_cache
 
 
 class Command(BaseCommand):
@@ -37,22 +39,49 @@ class Command(BaseCommand):
             },
         ]
 
-        created_count = 0
-        updated_count = 0
+        # Upsert all sites and fix up the default flag in one transaction
+        with transaction.atomic():
+            existing_names = set(
+                Site.objects.filter(name__in=[site_data['name'] for site_data in sites_data])
+                .values_list('name', flat=True)
+            )
+            # Single upsert; the static data above is known to pass Site.clean(),
+            # so skip the per-row full_clean() uniqueness SELECTs
+            sites = [
+                Site(
+                    name=site_data['name'],
+                    domain=site_data['domain'],
+                    display_name=site_data['display_name'],
+                    base_url=site_data['base_url'],
+                    is_default=site_data.get('is_default', False),
+                    is_active=True,
+                )
+                for site_data in sites_data
+            ]
+            Site.objects.bulk_create(
+                sites,
+                update_conflicts=True,
+                unique_fields=['name'],
+                update_fields=['domain', 'display_name', 'base_url', 'is_default', 'is_active', 'updated_at'],
+            )
 
-        for site_data in sites_data:
-            site, created = Site.objects.update_or_create(
-                name=site_data['name'],
-                defaults={
-                    'domain': site_data['domain'],
-                    'display_name': site_data['display_name'],
-                    'base_url': site_data['base_url'],
-                    'is_default': site_data.get('is_default', False),
-                    'is_active': True,
-                }
+            # Ensure only one default site: keep the first one, unset others
+            default_sites = list(
+                Site.objects.filter(is_default=True).order_by('name').values_list('id', 'display_name')
             )
+            extra_defaults = default_sites[1:]
+            unset_defaults = [display_name for _, display_name in extra_defaults]
+            if extra_defaults:
+                Site.objects.filter(id__in=[site_id for site_id, _ in extra_defaults]).update(is_default=False)
+
+        # bulk_create and update() bypass post_save, so refresh cached sites explicitly
+        clear_site_cache()
 
-            if created:
+        created_count = 0
+        updated_count = 0
+
+        for site in sites:
+            if site.name not in existing_names:
                 created_count += 1
                 self.stdout.write(
                     self.style.SUCCESS(f'✓ Created site: {site.display_name} ({site.domain})')
@@ -63,17 +92,10 @@ class Command(BaseCommand):
                     self.style.SUCCESS(f'✓ Updated site: {site.display_name} ({site.domain})')
                 )
 
-        # Ensure only one default site
-        default_sites = Site.objects.filter(is_default=True)
-        if default_sites.count() > 1:
-            # Keep the first one as default, unset others
-            first_default = default_sites.first()
-            for site in default_sites.exclude(id=first_default.id):
-                site.is_default = False
-                site.save()
-                self.stdout.write(
-                    self.style.WARNING(f'  Unset default flag for: {site.display_name}')
-                )
+        for display_name in unset_defaults:
+            self.stdout.write(
+                self.style.WARNING(f'  Unset default flag for: {display_name}')
+            )
 
         self.stdout.write(
             self.style.SUCCESS(
@@ -84,71 +84,63 @@ class Site(models.Model):
         """
         Get site from domain name
         Checks both primary domain and additional domains
+        Served from the process-level site cache in apps.core.utils
         """
-        # Remove protocol if present
-        if '://' in domain:
-            from urllib.parse import urlparse
-            domain = urlparse(domain).netloc
-        
-        # Remove www. prefix for matching
-        domain_clean = domain.replace('www.', '')
-        
-        # Try to find by primary domain
-        site = cls.objects.filter(
-            models.Q(domain=domain) | 
-            models.Q(domain=domain_clean) |
-            models.Q(domain__icontains=domain_clean)
-        ).first()
-        
-        if site:
-            return site
-        
-        # Try to find by additional domains
-        site = cls.objects.filter(
-            additional_domains__contains=[domain]
-        ).first()
-        
-        if site:
-            return site
-        
-        # Return default site if exists
-        return cls.objects.filter(is_default=True, is_active=True).first()
+        from .utils import get_site_from_domain
+        return get_site_from_domain(domain)
     
     @classmethod
     def get_site_from_request(cls, request):
         """
         Get site from request headers
         Checks Origin, Referer, and custom X-Site-Identifier header
+        Served from the process-level site cache in apps.core.utils
         """
-        # Check custom header first (for API calls)
-        site_identifier = request.headers.get('X-Site-Identifier')
-        if site_identifier:
-            try:
-                return cls.objects.get(id=site_identifier, is_active=True)
-            except (cls.DoesNotExist, ValueError):
-                pass
-        
-        # Check Origin header
-        origin = request.headers.get('Origin')
-        if origin:
-            site = cls.get_site_from_domain(origin)
-            if site:
-                return site
-        
-        # Check Referer header
-        referer = request.META.get('HTTP_REFERER', '')
-        if referer:
-            site = cls.get_site_from_domain(referer)
-            if site:
-                return site
-        
-        # Check Host header
-        host = request.get_host()
-        if host:
-            site = cls.get_site_from_domain(host)
-            if site:
-                return site
-        
-        # Return default site
-        return cls.objects.filter(is_default=True, is_active=True).first()
+        from .utils import get_site_from_request
+        return get_site_from_request(request)
+
+
 
+class SiteDailyStats(models.Model):
+    """
+    Daily per-site rollup of submissions created, bucketed by status
+    Refreshed nightly by apps.core.tasks.refresh_daily_stats so dashboard
+    trends can sum a few rows instead of scanning the source tables
+    Rows are bucketed by status when a day is rebuilt; the nightly job only
+    rebuilds the last few days, older days via backfill_daily_stats
+    """
+    MODEL_CHOICES = [
+        ('contacts', 'Contacts'),
+        ('waitlist', 'Waitlist'),
+        ('leads', 'Leads'),
+        ('newsletter', 'Newsletter'),
+    ]
+    
+    site = models.ForeignKey(
+        Site,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='daily_stats',
+        help_text="Site the rows belong to (empty for rows without a site)"
+    )
+    date = models.DateField(help_text="Day the rows were created on")
+    model_name = models.CharField(max_length=20, choices=MODEL_CHOICES)
+    status_bucket = models.CharField(
+        max_length=30,
+        help_text="Row status at refresh time ('spam' for spam contacts)"
+    )
+    count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-date', 'model_name']
+        verbose_name = 'Site Daily Stats'
+        verbose_name_plural = 'Site Daily Stats'
+        unique_together = [('site', 'date', 'model_name', 'status_bucket')]
+        indexes = [
+            models.Index(fields=['date', 'model_name'], name='site_daily_stats_date_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.date} {self.model_name}/{self.status_bucket}: {self.count}"
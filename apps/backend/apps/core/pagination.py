@@ -0,0 +1,47 @@
+"""
+Pagination classes shared by the API viewsets
+"""
+import hashlib
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+from rest_framework.pagination import PageNumberPagination
+
+CACHE_KEY_PAGINATION_COUNT = 'pagination_count_{}'  # {md5 of the count query SQL}
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Paginator that caches COUNT(*) for large result sets
+    Counts below PAGINATION_COUNT_CACHE_MIN_ROWS are cheap and always computed
+    live, so small tables never show a stale total
+    """
+    
+    @cached_property
+    def count(self):
+        object_list = self.object_list
+        if not hasattr(object_list, 'query'):
+            return super().count
+        
+        try:
+            sql, params = object_list.query.sql_with_params()
+        except EmptyResultSet:
+            return 0
+        cache_key = CACHE_KEY_PAGINATION_COUNT.format(
+            hashlib.md5(f"{sql}|{params}".encode(), usedforsecurity=False).hexdigest()
+        )
+        count = cache.get(cache_key)
+        if count is not None:
+            return count
+        
+        count = object_list.count()
+        if count >= getattr(settings, 'PAGINATION_COUNT_CACHE_MIN_ROWS', 10000):
+            cache.set(cache_key, count, getattr(settings, 'PAGINATION_COUNT_CACHE_TIMEOUT', 60))
+        return count
+
+
+class CachedCountPageNumberPagination(PageNumberPagination):
+    """PageNumberPagination whose total count is cached for large tables"""
+    django_paginator_class = CachedCountPaginator
@@ -0,0 +1,104 @@
+"""
+Daily stats rollup services for the dashboard
+"""
+import logging
+from datetime import datetime, time, timedelta
+from django.db import transaction
+from django.db.models import Case, CharField, Count, F, Q, Sum, Value, When
+from django.utils import timezone
+
+from .models import SiteDailyStats
+
+logger = logging.getLogger(__name__)
+
+# Rollup rows counted by each dashboard trend
+TREND_FILTERS = {
+    'contacts': ~Q(status_bucket='spam'),
+    'waitlist': Q(),
+    'leads': Q(),
+    'newsletter': Q(status_bucket='subscribed'),
+}
+
+
+def _rollup_sources():
+    """
+    Source querysets and status bucket expressions per rollup model
+    Imported lazily since these apps depend on core.models
+    Returns: dict of model_name -> (queryset, bucket expression)
+    """
+    from apps.contacts.models import ContactSubmission
+    from apps.waitlist.models import WaitlistEntry
+    from apps.leads.models import Lead
+    from apps.newsletter.models import NewsletterSubscription
+    
+    return {
+        'contacts': (
+            # Still-pending submissions are hidden from the lists until finalized
+            ContactSubmission.objects.exclude(status='pending_spam_check'),
+            Case(When(is_spam=True, then=Value('spam')), default=F('status'), output_field=CharField()),
+        ),
+        'waitlist': (WaitlistEntry.objects.all(), F('status')),
+        'leads': (Lead.objects.all(), F('status')),
+        'newsletter': (NewsletterSubscription.objects.all(), F('subscription_status')),
+    }
+
+
+def refresh_daily_stats(date):
+    """
+    Rebuild the rollup rows for one local calendar day from the source tables
+    Returns: number of rows written
+    """
+    start = timezone.make_aware(datetime.combine(date, time.min))
+    end = timezone.make_aware(datetime.combine(date + timedelta(days=1), time.min))
+    
+    rows = []
+    for model_name, (queryset, bucket) in _rollup_sources().items():
+        counts = (
+            queryset.filter(created_at__gte=start, created_at__lt=end)
+            .annotate(bucket=bucket)
+            .values('site_id', 'bucket')
+            .annotate(count=Count('id'))
+            .order_by()
+        )
+        rows.extend(
+            SiteDailyStats(
+                site_id=row['site_id'],
+                date=date,
+                model_name=model_name,
+                status_bucket=row['bucket'],
+                count=row['count'],
+            )
+            for row in counts
+        )
+    
+    with transaction.atomic():
+        SiteDailyStats.objects.filter(date=date).delete()
+        SiteDailyStats.objects.bulk_create(rows)
+    
+    logger.info(f"Refreshed daily stats for {date}: {len(rows)} rows")
+    return len(rows)
+
+
+def get_rollup_trend_counts(site_kwargs, last_month_start, month_start, today):
+    """
+    Sum rollup rows for the dashboard trend windows in a single query
+    Windows are [last_month_start, month_start) and [month_start, today)
+    site_kwargs: filter kwargs narrowing rows to one site ({} for all sites)
+    Returns: dict of model_name -> (this_month, last_month)
+    """
+    aggregates = {}
+    for name, condition in TREND_FILTERS.items():
+        model_q = Q(model_name=name) & condition
+        aggregates[f'{name}_this_month'] = Sum('count', filter=model_q & Q(date__gte=month_start))
+        aggregates[f'{name}_last_month'] = Sum('count', filter=model_q & Q(date__lt=month_start))
+    
+    totals = SiteDailyStats.objects.filter(
+        date__gte=last_month_start,
+        date__lt=today,
+        **site_kwargs,
+    ).aggregate(**aggregates)
+    
+    return {
+        name: (totals[f'{name}_this_month'] or 0, totals[f'{name}_last_month'] or 0)
+        for name in TREND_FILTERS
+    }
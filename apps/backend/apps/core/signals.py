@@ -0,0 +1,46 @@
+"""
+Signal handlers for core site and dashboard caching
+"""
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+
+from apps.contacts.models import ContactSubmission
+from apps.waitlist.models import WaitlistEntry
+from apps.leads.models import Lead
+from apps.newsletter.models import NewsletterSubscription
+from .api_views import CACHE_KEY_DASHBOARD_STATS
+from .models import Site
+from .utils import clear_site_cache
+
+DASHBOARD_STATS_MODELS = (ContactSubmission, WaitlistEntry, Lead, NewsletterSubscription)
+
+
+def invalidate_dashboard_stats(sender, instance, **kwargs):
+    """
+    Drop cached dashboard stats for the instance's site and the unfiltered view
+    Queryset .update()/.delete() bypass signals; those changes show up once the cache expires
+    """
+    keys = [CACHE_KEY_DASHBOARD_STATS.format('all')]
+    if instance.site_id:
+        keys.append(CACHE_KEY_DASHBOARD_STATS.format(instance.site_id))
+    cache.delete_many(keys)
+
+
+for model in DASHBOARD_STATS_MODELS:
+    post_save.connect(
+        invalidate_dashboard_stats, sender=model,
+        dispatch_uid=f'dashboard_stats_save_{model.__name__}'
+    )
+    post_delete.connect(
+        invalidate_dashboard_stats, sender=model,
+        dispatch_uid=f'dashboard_stats_delete_{model.__name__}'
+    )
+
+
+def invalidate_site_cache(sender, **kwargs):
+    """Reload cached sites in every process after a Site change"""
+    clear_site_cache()
+
+
+post_save.connect(invalidate_site_cache, sender=Site, dispatch_uid='site_cache_save')
+post_delete.connect(invalidate_site_cache, sender=Site, dispatch_uid='site_cache_delete')
@@ -0,0 +1,40 @@
+"""
+Celery tasks for core dashboard stats
+"""
+from celery import shared_task
+from datetime import date as date_cls, timedelta
+from django.conf import settings
+from django.utils import timezone
+import logging
+from .services import refresh_daily_stats as refresh_daily_stats_for_date
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def refresh_daily_stats(date=None, days=None):
+    """
+    Background job to roll up recent submissions into SiteDailyStats
+    Should be run daily via Celery Beat
+    Rebuilds the trailing DASHBOARD_STATS_REFRESH_DAYS days (excluding today),
+    so a missed run is filled in and recent status changes reach their day;
+    older days only change when rebuilt with `manage.py backfill_daily_stats`
+    date: ISO date string to refresh that single day instead
+    days: number of trailing days to rebuild instead of the setting
+    Returns: number of rows written
+    """
+    if date:
+        target_days = [date_cls.fromisoformat(date)]
+    else:
+        today = timezone.localdate()
+        days = days or settings.DASHBOARD_STATS_REFRESH_DAYS
+        target_days = [today - timedelta(days=offset) for offset in range(days, 0, -1)]
+    
+    total_rows = 0
+    for day in target_days:
+        # One failed day should not leave the rest of the window stale
+        try:
+            total_rows += refresh_daily_stats_for_date(day)
+        except Exception as e:
+            logger.error(f"Error refreshing daily stats for {day}: {str(e)}")
+    return total_rows
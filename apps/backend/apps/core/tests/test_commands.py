@@ -0,0 +1,41 @@
+"""
+Tests for core management commands
+"""
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from apps.core.models import Site
+from apps.core.utils import clear_site_cache, get_site_from_domain
+
+
+class SetupSitesCommandTest(TestCase):
+    """Test setup_sites command"""
+
+    def setUp(self):
+        clear_site_cache()
+        self.addCleanup(clear_site_cache)
+
+    def test_creates_and_updates_sites(self):
+        """Test sites are upserted by name and the cache is refreshed"""
+        Site.objects.create(name='reliqo', domain='old.app', base_url='https://old.app', is_active=False)
+        get_site_from_domain('old.app')
+
+        out = StringIO()
+        call_command('setup_sites', stdout=out)
+
+        self.assertIn('Created: 3, Updated: 1', out.getvalue())
+        self.assertEqual(Site.objects.count(), 4)
+        reliqo = Site.objects.get(name='reliqo')
+        self.assertEqual(reliqo.domain, 'reliqo.app')
+        self.assertTrue(reliqo.is_active)
+        self.assertEqual(get_site_from_domain('reliqo.app'), reliqo)
+
+    def test_single_default_site(self):
+        """Test extra default sites are unset"""
+        Site.objects.create(name='aaa', domain='aaa.test', base_url='https://aaa.test', is_default=True)
+
+        out = StringIO()
+        call_command('setup_sites', stdout=out)
+
+        self.assertEqual(list(Site.objects.filter(is_default=True).values_list('name', flat=True)), ['aaa'])
+        self.assertIn('Unset default flag for: Oasys360', out.getvalue())
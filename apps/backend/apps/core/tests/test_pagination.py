@@ -0,0 +1,39 @@
+"""
+Tests for core pagination
+"""
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from apps.core.models import Site
+from apps.core.pagination import CachedCountPaginator
+
+
+class CachedCountPaginatorTest(TestCase):
+    """Test CachedCountPaginator"""
+
+    def setUp(self):
+        cache.clear()
+        for name in ('alpha', 'beta', 'gamma'):
+            Site.objects.create(name=name, domain=f'{name}.example.com', base_url=f'https://{name}.example.com')
+
+    @override_settings(PAGINATION_COUNT_CACHE_MIN_ROWS=2)
+    def test_large_count_cached(self):
+        """Test counts at or above the threshold are served from cache"""
+        queryset = Site.objects.order_by('name')
+        self.assertEqual(CachedCountPaginator(queryset, 2).count, 3)
+
+        Site.objects.create(name='delta', domain='delta.example.com', base_url='https://delta.example.com')
+        with self.assertNumQueries(0):
+            self.assertEqual(CachedCountPaginator(queryset, 2).count, 3)
+
+    def test_small_count_not_cached(self):
+        """Test counts below the threshold are always computed live"""
+        queryset = Site.objects.order_by('name')
+        self.assertEqual(CachedCountPaginator(queryset, 2).count, 3)
+
+        Site.objects.create(name='delta', domain='delta.example.com', base_url='https://delta.example.com')
+        self.assertEqual(CachedCountPaginator(queryset, 2).count, 4)
+
+    def test_empty_queryset(self):
+        """Test an empty queryset counts as zero without querying"""
+        with self.assertNumQueries(0):
+            self.assertEqual(CachedCountPaginator(Site.objects.none(), 2).count, 0)
@@ -0,0 +1,22 @@
+"""
+Tests for core daily stats services
+"""
+from django.test import TestCase
+from django.utils import timezone
+from apps.contacts.tests.factories import ContactSubmissionFactory
+from apps.core.models import SiteDailyStats
+from apps.core.services import refresh_daily_stats
+
+
+class RefreshDailyStatsTest(TestCase):
+    """Test refresh_daily_stats rollup"""
+
+    def test_pending_spam_checks_excluded(self):
+        """Test submissions awaiting their spam check are not counted"""
+        ContactSubmissionFactory(status='new')
+        ContactSubmissionFactory(status='pending_spam_check')
+
+        refresh_daily_stats(timezone.localdate())
+
+        rows = SiteDailyStats.objects.filter(model_name='contacts')
+        self.assertEqual({row.status_bucket: row.count for row in rows}, {'new': 1})
@@ -0,0 +1,36 @@
+"""
+Tests for core Celery tasks
+"""
+from datetime import date
+from unittest.mock import patch
+from django.test import TestCase, override_settings
+from apps.core.tasks import refresh_daily_stats
+
+
+@override_settings(DASHBOARD_STATS_REFRESH_DAYS=3)
+class RefreshDailyStatsTaskTest(TestCase):
+    """Test refresh_daily_stats task"""
+
+    @patch('apps.core.tasks.timezone.localdate', return_value=date(2026, 3, 10))
+    @patch('apps.core.tasks.refresh_daily_stats_for_date', return_value=2)
+    def test_refreshes_trailing_window(self, mock_refresh, mock_localdate):
+        """Test the trailing days before today are rebuilt, oldest first"""
+        self.assertEqual(refresh_daily_stats(), 6)
+        self.assertEqual(
+            [call.args[0] for call in mock_refresh.call_args_list],
+            [date(2026, 3, 7), date(2026, 3, 8), date(2026, 3, 9)]
+        )
+
+    @patch('apps.core.tasks.timezone.localdate', return_value=date(2026, 3, 10))
+    @patch('apps.core.tasks.refresh_daily_stats_for_date')
+    def test_failed_day_does_not_stop_window(self, mock_refresh, mock_localdate):
+        """Test a failing day is logged and the remaining days still refresh"""
+        mock_refresh.side_effect = [RuntimeError('boom'), 1, 1]
+        self.assertEqual(refresh_daily_stats(), 2)
+        self.assertEqual(mock_refresh.call_count, 3)
+
+    @patch('apps.core.tasks.refresh_daily_stats_for_date', return_value=1)
+    def test_single_date(self, mock_refresh):
+        """Test an explicit date refreshes only that day"""
+        refresh_daily_stats(date='2026-03-01')
+        mock_refresh.assert_called_once_with(date(2026, 3, 1))
@@ -0,0 +1,95 @@
+"""
+Tests for core site utilities
+"""
+from unittest.mock import patch
+from django.test import TestCase, RequestFactory, override_settings
+from apps.core.models import Site
+from apps.core.utils import (
+    clear_site_cache,
+    get_site_by_identifier,
+    get_site_from_domain,
+    get_site_from_request,
+)
+
+
+class SiteLookupTest(TestCase):
+    """Test cached site lookups"""
+
+    def setUp(self):
+        clear_site_cache()
+        self.addCleanup(clear_site_cache)
+        self.site = Site.objects.create(
+            name='main',
+            domain='example.com',
+            base_url='https://example.com',
+            additional_domains=['shop.example.org'],
+        )
+        self.default_site = Site.objects.create(
+            name='fallback',
+            domain='fallback.test',
+            base_url='https://fallback.test',
+            is_default=True,
+        )
+
+    def test_domain_lookup(self):
+        """Test primary, www and additional domains resolve to the site"""
+        self.assertEqual(get_site_from_domain('example.com'), self.site)
+        self.assertEqual(get_site_from_domain('https://www.example.com/page'), self.site)
+        self.assertEqual(get_site_from_domain('shop.example.org'), self.site)
+        self.assertEqual(get_site_from_domain('www.shop.example.org'), self.site)
+        self.assertEqual(get_site_from_domain('unknown.test'), self.default_site)
+
+    def test_exact_domain_beats_www_variant(self):
+        """Test a site registered under www. wins over the bare domain's variant"""
+        www_site = Site.objects.create(
+            name='www-site', domain='www.example.com', base_url='https://www.example.com'
+        )
+        self.assertEqual(get_site_from_domain('www.example.com'), www_site)
+        self.assertEqual(get_site_from_domain('example.com'), self.site)
+
+    def test_domain_lookup_is_exact(self):
+        """Test partial domains do not match a longer site domain"""
+        self.assertEqual(get_site_from_domain('ample.com'), self.default_site)
+        self.assertEqual(get_site_from_domain('EXAMPLE.com'), self.site)
+
+    def test_lookup_served_from_cache(self):
+        """Test repeated lookups do not query the database"""
+        get_site_from_domain('example.com')
+        with self.assertNumQueries(0):
+            get_site_from_domain('example.com')
+
+    def test_cache_invalidated_on_save(self):
+        """Test saving a site refreshes the cache"""
+        get_site_from_domain('example.com')
+        self.site.additional_domains = ['new.example.org']
+        self.site.save()
+        self.assertEqual(get_site_from_domain('new.example.org'), self.site)
+
+    @override_settings(SITE_CACHE_TTL=60)
+    def test_cache_expires_without_version_bump(self):
+        """Test the process cache reloads after the TTL when no invalidation arrives"""
+        with patch('apps.core.utils.time.monotonic', return_value=1000.0):
+            get_site_from_domain('example.com')
+        # Simulate an edit made by another process whose version bump is not seen here
+        Site.objects.filter(pk=self.site.pk).update(domain='moved.example.com')
+        with patch('apps.core.utils.time.monotonic', return_value=1030.0):
+            self.assertEqual(get_site_from_domain('example.com'), self.site)
+        with patch('apps.core.utils.time.monotonic', return_value=1061.0):
+            self.assertEqual(get_site_from_domain('moved.example.com'), self.site)
+
+    def test_request_lookup(self):
+        """Test sites are resolved from request headers"""
+        request = RequestFactory().get('/', HTTP_X_SITE_IDENTIFIER=str(self.site.id))
+        self.assertEqual(get_site_from_request(request), self.site)
+        request = RequestFactory().get('/', HTTP_ORIGIN='https://example.com')
+        self.assertEqual(get_site_from_request(request), self.site)
+
+    def test_identifier_lookup(self):
+        """Test sites are resolved by ID or name, active only"""
+        self.assertEqual(get_site_by_identifier(str(self.site.id)), self.site)
+        self.assertEqual(get_site_by_identifier(self.site.id.hex.upper()), self.site)
+        self.assertEqual(get_site_by_identifier('main'), self.site)
+        self.assertIsNone(get_site_by_identifier('missing'))
+        self.site.is_active = False
+        self.site.save()
+        self.assertIsNone(get_site_by_identifier('main'))
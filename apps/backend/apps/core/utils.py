@@ -1,21 +1,164 @@
 """
 Utility functions for site detection and management
 """
+import time
+import uuid
+from urllib.parse import urlparse
+from django.conf import settings
+from django.core.cache import cache
 from .models import Site
 
+# Process-level cache of (version, sites ordered by name, domain index, identifier index).
+# Sites change rarely, so lookups read these instead of querying.
+_SITE_CACHE = None
+# time.monotonic() after which _SITE_CACHE is reloaded regardless of version
+_SITE_CACHE_EXPIRES = 0.0
+# Shared version bumped on every Site change so other processes reload.
+# Only reaches other processes through a shared cache (Redis); with the
+# per-process LocMem fallback they pick up changes once SITE_CACHE_TTL expires
+SITE_CACHE_VERSION_KEY = 'core_site_cache_version'
+
+
+def _www_variant(domain):
+    """Get the domain with its www. prefix toggled"""
+    if domain.startswith('www.'):
+        return domain[len('www.'):]
+    return 'www.' + domain
+
+
+def _load_site_cache():
+    """
+    Get the (version, sites, domain index, identifier index) cache entry, loading it once per process
+    Reloads when the shared cache version changes (see clear_site_cache),
+    or after SITE_CACHE_TTL seconds as a backstop for missed version bumps
+    """
+    global _SITE_CACHE, _SITE_CACHE_EXPIRES
+    version = cache.get(SITE_CACHE_VERSION_KEY)
+    now = time.monotonic()
+    if _SITE_CACHE is None or _SITE_CACHE[0] != version or now >= _SITE_CACHE_EXPIRES:
+        sites = tuple(Site.objects.all())
+        # Lowercased domain -> site; primary domains win over additional ones,
+        # then sites earlier by name, and exact domains over www./bare variants
+        domains = [(site.domain.lower(), site) for site in sites]
+        domains += [
+            (domain.lower(), site)
+            for site in sites
+            for domain in site.additional_domains or ()
+        ]
+        domain_index = {}
+        for domain, site in domains:
+            domain_index.setdefault(domain, site)
+        for domain, site in domains:
+            domain_index.setdefault(_www_variant(domain), site)
+        # Canonical id string or name -> active site; ids win over names
+        active_sites = [site for site in sites if site.is_active]
+        identifier_index = {str(site.id): site for site in active_sites}
+        for site in active_sites:
+            identifier_index.setdefault(site.name, site)
+        _SITE_CACHE = (version, sites, domain_index, identifier_index)
+        _SITE_CACHE_EXPIRES = now + settings.SITE_CACHE_TTL
+    return _SITE_CACHE
+
+
+def get_cached_sites():
+    """Get all sites ordered by name, cached per process (see _load_site_cache)"""
+    return _load_site_cache()[1]
+
+
+def clear_site_cache():
+    """
+    Drop this process's site cache and signal other processes to reload theirs
+    Called from apps.core.signals when a Site is saved or deleted
+    """
+    global _SITE_CACHE
+    _SITE_CACHE = None
+    cache.set(SITE_CACHE_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def _default_site(sites):
+    """Get the first active default site"""
+    for site in sites:
+        if site.is_default and site.is_active:
+            return site
+    return None
+
+
+def _match_domain(site_cache, domain):
+    """
+    Get site matching a domain, falling back to the default site
+    Checks both primary domain and additional domains, with and without www.
+    """
+    _, sites, domain_index, _ = site_cache
+    
+    # Remove protocol if present
+    if '://' in domain:
+        domain = urlparse(domain).netloc
+    
+    # Exact match only (the index already holds www./bare variants); a substring
+    # match let 'example.com' resolve to any site whose domain merely contains it
+    site = domain_index.get(domain.lower())
+    if site:
+        return site
+    
+    # Return default site if exists
+    return _default_site(sites)
+
+
+def get_site_by_identifier(identifier):
+    """
+    Get active site by ID or name
+    Returns None if no active site matches
+    """
+    identifier_index = _load_site_cache()[3]
+    identifier = str(identifier)
+    site = identifier_index.get(identifier)
+    if site:
+        return site
+    
+    # Non-canonical UUID spellings (uppercase, no hyphens, braces)
+    try:
+        return identifier_index.get(str(uuid.UUID(identifier)))
+    except ValueError:
+        return None
+
 
 def get_site_from_request(request):
     """
     Get site from request headers
-    This is a convenience function that wraps Site.get_site_from_request
+    Checks X-Site-Identifier, Origin, Referer and Host headers
     """
-    return Site.get_site_from_request(request)
+    site_cache = _load_site_cache()
+    sites = site_cache[1]
+    
+    # Check custom header first (for API calls)
+    site_identifier = request.headers.get('X-Site-Identifier')
+    if site_identifier:
+        try:
+            site_id = uuid.UUID(site_identifier)
+        except ValueError:
+            site_id = None
+        for site in sites:
+            if site.id == site_id and site.is_active:
+                return site
+    
+    # Check Origin, Referer and Host headers in turn
+    for domain in (
+        request.headers.get('Origin'),
+        request.META.get('HTTP_REFERER', ''),
+        request.get_host(),
+    ):
+        if domain:
+            site = _match_domain(site_cache, domain)
+            if site:
+                return site
+    
+    # Return default site
+    return _default_site(sites)
 
 
 def get_site_from_domain(domain):
     """
     Get site from domain name
-    This is a convenience function that wraps Site.get_site_from_domain
+    Checks both primary domain and additional domains
     """
-    return Site.get_site_from_domain(domain)
-
+    return _match_domain(_load_site_cache(), domain)
@@ -2,7 +2,10 @@
 GDPR admin configuration
 """
 from django.contrib import admin
+from django.db.models import F, Func, IntegerField
+from django.db.models.functions import Coalesce
 from django.utils.html import format_html
+from django.utils.safestring import mark_safe
 from import_export import resources
 from import_export.admin import ImportExportModelAdmin
 from django_admin_listfilter_dropdown.filters import DropdownFilter
@@ -18,6 +21,58 @@ class ConsentResource(resources.ModelResource):
         export_order = fields
 
 
+TYPE_BADGE_HTML = (
+    '<span style="background-color: {}; color: white; padding: 3px 8px; '
+    'border-radius: 3px; font-size: 11px;">{}</span>'
+)
+
+
+def _type_badges(choices, colors):
+    """
+    Build each choice's badge HTML once at import time
+    Returns: dict of choice value -> SafeString
+    """
+    return {
+        value: format_html(TYPE_BADGE_HTML, colors.get(value, 'gray'), label)
+        for value, label in choices
+    }
+
+
+CONSENT_TYPE_BADGES = _type_badges(Consent.CONSENT_TYPE_CHOICES, {
+    'marketing': 'blue',
+    'analytics': 'green',
+    'necessary': 'gray',
+    'functional': 'orange',
+    'advertising': 'purple',
+})
+DELETION_TYPE_BADGES = _type_badges(DataDeletionAudit._meta.get_field('deletion_type').choices, {
+    'full': 'red',
+    'anonymize': 'orange',
+    'partial': 'yellow',
+})
+CONSENT_STATUS_GIVEN = mark_safe('<span style="color: green;">✓ Given</span>')
+CONSENT_STATUS_WITHDRAWN = mark_safe('<span style="color: red;">✗ Withdrawn</span>')
+CONSENT_STATUS_NONE = mark_safe('<span style="color: gray;">—</span>')
+POLICY_ACTIVE = mark_safe('<span style="color: green; font-weight: bold;">✓ Active</span>')
+POLICY_INACTIVE = mark_safe('<span style="color: gray;">Inactive</span>')
+RETENTION_ANONYMIZE = mark_safe('<span style="background-color: orange; color: white; padding: 3px 8px; border-radius: 3px;">Anonymize</span>')
+RETENTION_DELETE = mark_safe('<span style="background-color: red; color: white; padding: 3px 8px; border-radius: 3px;">Delete</span>')
+RETENTION_MANUAL = mark_safe('<span style="color: gray;">Manual</span>')
+RETENTION_ACTIVE = mark_safe('<span style="color: green;">✓</span>')
+RETENTION_INACTIVE = mark_safe('<span style="color: gray;">✗</span>')
+DELETION_CONFIRMED = mark_safe('<span style="color: green;">✓ Confirmed</span>')
+DELETION_PENDING = mark_safe('<span style="color: orange;">⚠ Pending</span>')
+
+
+class JSONArrayLength(Func):
+    """Length of a JSON array column (jsonb_array_length on PostgreSQL)"""
+    function = 'jsonb_array_length'
+    output_field = IntegerField()
+    
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super().as_sql(compiler, connection, function='json_array_length', **extra_context)
+
+
 class PrivacyPolicyResource(resources.ModelResource):
     """Resource for import/export"""
     class Meta:
@@ -66,31 +121,25 @@ class ConsentAdmin(ImportExportModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        """Join privacy policies so privacy_policy_version doesn't query per row"""
+        return super().get_queryset(request).select_related('privacy_policy')
+    
     def consent_type_badge(self, obj):
         """Display consent type with badge"""
-        colors = {
-            'marketing': 'blue',
-            'analytics': 'green',
-            'necessary': 'gray',
-            'functional': 'orange',
-            'advertising': 'purple',
-        }
-        color = colors.get(obj.consent_type, 'gray')
-        return format_html(
-            '<span style="background-color: {}; color: white; padding: 3px 8px; '
-            'border-radius: 3px; font-size: 11px;">{}</span>',
-            color,
-            obj.get_consent_type_display()
-        )
+        badge = CONSENT_TYPE_BADGES.get(obj.consent_type)
+        if badge is None:
+            badge = format_html(TYPE_BADGE_HTML, 'gray', obj.get_consent_type_display())
+        return badge
     consent_type_badge.short_description = 'Type'
     
     def consent_status(self, obj):
         """Display consent status"""
         if obj.consent_given:
-            return format_html('<span style="color: green;">✓ Given</span>')
+            return CONSENT_STATUS_GIVEN
         elif obj.withdrawal_timestamp:
-            return format_html('<span style="color: red;">✗ Withdrawn</span>')
-        return format_html('<span style="color: gray;">—</span>')
+            return CONSENT_STATUS_WITHDRAWN
+        return CONSENT_STATUS_NONE
     consent_status.short_description = 'Status'
     
     def privacy_policy_version(self, obj):
@@ -131,8 +180,8 @@ class PrivacyPolicyAdmin(ImportExportModelAdmin):
     def active_badge(self, obj):
         """Display active status"""
         if obj.is_active:
-            return format_html('<span style="color: green; font-weight: bold;">✓ Active</span>')
-        return format_html('<span style="color: gray;">Inactive</span>')
+            return POLICY_ACTIVE
+        return POLICY_INACTIVE
     active_badge.short_description = 'Status'
 
 
@@ -165,17 +214,17 @@ class DataRetentionPolicyAdmin(ImportExportModelAdmin):
     def action_badge(self, obj):
         """Display action type"""
         if obj.anonymize_instead:
-            return format_html('<span style="background-color: orange; color: white; padding: 3px 8px; border-radius: 3px;">Anonymize</span>')
+            return RETENTION_ANONYMIZE
         elif obj.auto_delete:
-            return format_html('<span style="background-color: red; color: white; padding: 3px 8px; border-radius: 3px;">Delete</span>')
-        return format_html('<span style="color: gray;">Manual</span>')
+            return RETENTION_DELETE
+        return RETENTION_MANUAL
     action_badge.short_description = 'Action'
     
     def active_badge(self, obj):
         """Display active status"""
         if obj.is_active:
-            return format_html('<span style="color: green;">✓</span>')
-        return format_html('<span style="color: gray;">✗</span>')
+            return RETENTION_ACTIVE
+        return RETENTION_INACTIVE
     active_badge.short_description = 'Active'
 
 
@@ -210,29 +259,27 @@ class DataDeletionAuditAdmin(admin.ModelAdmin):
     
     def deletion_type_badge(self, obj):
         """Display deletion type"""
-        colors = {
-            'full': 'red',
-            'anonymize': 'orange',
-            'partial': 'yellow',
-        }
-        color = colors.get(obj.deletion_type, 'gray')
-        return format_html(
-            '<span style="background-color: {}; color: white; padding: 3px 8px; '
-            'border-radius: 3px; font-size: 11px;">{}</span>',
-            color,
-            obj.get_deletion_type_display()
-        )
+        badge = DELETION_TYPE_BADGES.get(obj.deletion_type)
+        if badge is None:
+            badge = format_html(TYPE_BADGE_HTML, 'gray', obj.get_deletion_type_display())
+        return badge
     deletion_type_badge.short_description = 'Type'
     
+    def get_queryset(self, request):
+        """Count deleted data types in SQL instead of decoding the JSON per row"""
+        return super().get_queryset(request).annotate(
+            dt_count=Coalesce(JSONArrayLength(F('data_types_deleted')), 0)
+        )
+    
     def data_types_count(self, obj):
         """Display count of data types deleted"""
-        count = len(obj.data_types_deleted) if obj.data_types_deleted else 0
-        return count
+        return obj.dt_count
     data_types_count.short_description = 'Data Types'
+    data_types_count.admin_order_field = 'dt_count'
     
     def confirmed_badge(self, obj):
         """Display confirmation status"""
         if obj.confirmed_at:
-            return format_html('<span style="color: green;">✓ Confirmed</span>')
-        return format_html('<span style="color: orange;">⚠ Pending</span>')
+            return DELETION_CONFIRMED
+        return DELETION_PENDING
     confirmed_badge.short_description = 'Confirmed'
@@ -6,6 +6,7 @@ import json
 import logging
 from datetime import timedelta
 from django.utils import timezone
+from django.db import transaction
 from django.db.models import Q
 from django.conf import settings
 
@@ -20,6 +21,9 @@ class GDPRService:
     Service for GDPR compliance operations
     """
     
+    # Rows removed per DELETE statement during retention sweeps
+    RETENTION_DELETE_BATCH_SIZE = 10000
+    
     @staticmethod
     def hash_email(email):
         """Hash email for anonymization"""
@@ -315,6 +319,27 @@ class GDPRService:
         """
         return GDPRService.export_user_data(email)
     
+    @staticmethod
+    def _delete_in_batches(queryset, batch_size=None):
+        """
+        Delete queryset rows in bounded batches, one transaction per batch
+        Uses _raw_delete (no per-row signals or cascade collection), so only call it
+        for models that nothing references
+        Returns: number of rows deleted
+        """
+        batch_size = batch_size or GDPRService.RETENTION_DELETE_BATCH_SIZE
+        model = queryset.model
+        deleted = 0
+        while True:
+            with transaction.atomic(using=queryset.db):
+                pks = list(queryset.values_list('pk', flat=True)[:batch_size])
+                if not pks:
+                    break
+                deleted += model._base_manager.using(queryset.db).filter(pk__in=pks)._raw_delete(queryset.db)
+            if len(pks) < batch_size:
+                break
+        return deleted
+    
     @staticmethod
     def apply_retention_policies():
         """
@@ -333,14 +358,9 @@ class GDPRService:
                 count = queryset.count()
                 if policy.anonymize_instead:
                     # Use anonymization service
-                    for contact in queryset:
-                        AnonymizationService.anonymize_contact_submission(
-                            contact,
-                            reason='Retention policy',
-                            keep_audit=True
-                        )
+                    AnonymizationService.anonymize_queryset('contacts', queryset, reason='Retention policy')
                 elif policy.auto_delete:
-                    queryset.delete()
+                    GDPRService._delete_in_batches(queryset)
                 summary[policy.data_type] = count
             
             elif policy.data_type == 'waitlist':
@@ -349,14 +369,9 @@ class GDPRService:
                 count = queryset.count()
                 if policy.anonymize_instead:
                     # Use anonymization service
-                    for entry in queryset:
-                        AnonymizationService.anonymize_waitlist_entry(
-                            entry,
-                            reason='Retention policy',
-                            keep_audit=True
-                        )
+                    AnonymizationService.anonymize_queryset('waitlist', queryset, reason='Retention policy')
                 elif policy.auto_delete:
-                    queryset.delete()
+                    GDPRService._delete_in_batches(queryset)
                 summary[policy.data_type] = count
             
             elif policy.data_type == 'lead':
@@ -365,14 +380,9 @@ class GDPRService:
                 count = queryset.count()
                 if policy.anonymize_instead:
                     # Use anonymization service
-                    for lead in queryset:
-                        AnonymizationService.anonymize_lead(
-                            lead,
-                            reason='Retention policy',
-                            keep_audit=True
-                        )
+                    AnonymizationService.anonymize_queryset('leads', queryset, reason='Retention policy')
                 elif policy.auto_delete:
-                    queryset.delete()
+                    GDPRService._delete_in_batches(queryset)
                 summary[policy.data_type] = count
             
             elif policy.data_type == 'analytics_pageview':
@@ -380,7 +390,7 @@ class GDPRService:
                 queryset = PageView.objects.filter(timestamp__lt=cutoff_date)
                 count = queryset.count()
                 if policy.auto_delete:
-                    queryset.delete()
+                    GDPRService._delete_in_batches(queryset)
                 summary[policy.data_type] = count
             
             elif policy.data_type == 'analytics_event':
@@ -388,7 +398,7 @@ class GDPRService:
                 queryset = Event.objects.filter(timestamp__lt=cutoff_date)
                 count = queryset.count()
                 if policy.auto_delete:
-                    queryset.delete()
+                    GDPRService._delete_in_batches(queryset)
                 summary[policy.data_type] = count
         
         logger.info(f"Applied retention policies: {summary}")
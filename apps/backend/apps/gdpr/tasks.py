@@ -2,18 +2,29 @@
 Celery tasks for GDPR compliance
 """
 from celery import shared_task
+from django.core.cache import cache
 import logging
+import uuid
 from .services import GDPRService
 
 logger = logging.getLogger(__name__)
 
+RETENTION_LOCK_KEY = 'gdpr_retention_lock'
+RETENTION_LOCK_TIMEOUT = 3600  # Expires on its own if a worker dies mid-sweep
+
 
 @shared_task
 def apply_data_retention_policies():
     """
     Background job to apply data retention policies
     Should be run daily via Celery Beat
+    Skips the run if a previous sweep still holds the lock
     """
+    token = uuid.uuid4().hex
+    if not cache.add(RETENTION_LOCK_KEY, token, RETENTION_LOCK_TIMEOUT):
+        logger.info("Data retention sweep already running, skipping")
+        return None
+    
     try:
         summary = GDPRService.apply_retention_policies()
         logger.info(f"Applied data retention policies: {summary}")
@@ -21,3 +32,7 @@ def apply_data_retention_policies():
     except Exception as e:
         logger.error(f"Error applying retention policies: {str(e)}")
         return None
+    finally:
+        # Don't release a lock that expired and was taken by another run
+        if cache.get(RETENTION_LOCK_KEY) == token:
+            cache.delete(RETENTION_LOCK_KEY)
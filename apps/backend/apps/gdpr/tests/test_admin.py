@@ -0,0 +1,53 @@
+"""
+Tests for GDPR admin
+"""
+from django.contrib.admin.sites import AdminSite
+from django.test import TestCase, RequestFactory
+from apps.gdpr.admin import ConsentAdmin, DataDeletionAuditAdmin
+from apps.gdpr.models import Consent, DataDeletionAudit
+
+
+class DataDeletionAuditAdminTest(TestCase):
+    """Test DataDeletionAuditAdmin"""
+
+    def setUp(self):
+        self.admin = DataDeletionAuditAdmin(DataDeletionAudit, AdminSite())
+        self.request = RequestFactory().get('/admin/gdpr/datadeletionaudit/')
+
+    def test_data_types_count_annotated(self):
+        """Test data types are counted by the changelist queryset"""
+        DataDeletionAudit.objects.create(
+            email='a@example.com', deletion_type='full',
+            data_types_deleted=['contacts', 'leads', 'newsletter']
+        )
+        DataDeletionAudit.objects.create(email='b@example.com', deletion_type='partial')
+
+        counts = {
+            obj.email: self.admin.data_types_count(obj)
+            for obj in self.admin.get_queryset(self.request)
+        }
+
+        self.assertEqual(counts, {'a@example.com': 3, 'b@example.com': 0})
+
+    def test_deletion_type_badge(self):
+        """Test deletion type badge uses the type's color and label"""
+        audit = DataDeletionAudit(email='a@example.com', deletion_type='anonymize')
+        badge = self.admin.deletion_type_badge(audit)
+        self.assertIn('background-color: orange', badge)
+        self.assertIn('>Anonymization</span>', badge)
+
+
+class ConsentAdminTest(TestCase):
+    """Test ConsentAdmin"""
+
+    def test_queryset_joins_privacy_policy(self):
+        """Test privacy policy versions load without a query per row"""
+        from apps.gdpr.tests.factories import ConsentFactory
+        ConsentFactory.create_batch(5)
+        consent_admin = ConsentAdmin(Consent, AdminSite())
+        request = RequestFactory().get('/admin/gdpr/consent/')
+
+        with self.assertNumQueries(1):
+            versions = [consent_admin.privacy_policy_version(obj) for obj in consent_admin.get_queryset(request)]
+
+        self.assertEqual(len(versions), 5)
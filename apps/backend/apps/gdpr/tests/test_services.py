@@ -0,0 +1,48 @@
+"""
+Tests for GDPR services
+"""
+from datetime import timedelta
+from unittest.mock import patch
+from django.test import TestCase
+from django.utils import timezone
+from apps.contacts.models import ContactSubmission
+from apps.contacts.tests.factories import ContactSubmissionFactory
+from apps.gdpr.services import GDPRService
+from apps.integrations.anonymization_service import AnonymizationService
+from apps.gdpr.tests.factories import DataRetentionPolicyFactory
+
+
+class ApplyRetentionPoliciesTest(TestCase):
+    """Test GDPRService.apply_retention_policies"""
+
+    def test_delete_expired_contacts_in_batches(self):
+        """Test expired rows are deleted across several batches and recent rows kept"""
+        DataRetentionPolicyFactory(data_type='contact', retention_days=30, auto_delete=True, anonymize_instead=False)
+        expired = ContactSubmissionFactory.create_batch(5)
+        recent = ContactSubmissionFactory()
+        ContactSubmission.objects.filter(pk__in=[c.pk for c in expired]).update(
+            created_at=timezone.now() - timedelta(days=60)
+        )
+
+        with patch.object(GDPRService, 'RETENTION_DELETE_BATCH_SIZE', 2):
+            summary = GDPRService.apply_retention_policies()
+
+        self.assertEqual(summary, {'contact': 5})
+        self.assertEqual(list(ContactSubmission.objects.values_list('pk', flat=True)), [recent.pk])
+
+    def test_anonymize_expired_contacts(self):
+        """Test expired rows are anonymized and rows sharing an email get the same value"""
+        DataRetentionPolicyFactory(data_type='contact', retention_days=30, auto_delete=False, anonymize_instead=True)
+        expired = ContactSubmissionFactory.create_batch(2, email='Old@Example.com')
+        recent = ContactSubmissionFactory(email='new@example.com')
+        ContactSubmission.objects.filter(pk__in=[c.pk for c in expired]).update(
+            created_at=timezone.now() - timedelta(days=60)
+        )
+
+        summary = GDPRService.apply_retention_policies()
+
+        self.assertEqual(summary, {'contact': 2})
+        anonymized = set(ContactSubmission.objects.exclude(pk=recent.pk).values_list('email', flat=True))
+        self.assertEqual(anonymized, {AnonymizationService.anonymize_email('old@example.com')})
+        recent.refresh_from_db()
+        self.assertEqual(recent.email, 'new@example.com')
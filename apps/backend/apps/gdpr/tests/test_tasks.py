@@ -0,0 +1,30 @@
+"""
+Tests for GDPR Celery tasks
+"""
+from unittest.mock import patch
+from django.core.cache import cache
+from django.test import TestCase
+from apps.gdpr.tasks import apply_data_retention_policies, RETENTION_LOCK_KEY
+
+
+class ApplyDataRetentionPoliciesTaskTest(TestCase):
+    """Test apply_data_retention_policies task"""
+
+    def setUp(self):
+        cache.delete(RETENTION_LOCK_KEY)
+
+    @patch('apps.gdpr.tasks.GDPRService.apply_retention_policies', return_value={'contact': 2})
+    def test_runs_and_releases_lock(self, mock_apply):
+        """Test sweep runs and releases the lock afterwards"""
+        self.assertEqual(apply_data_retention_policies(), {'contact': 2})
+        mock_apply.assert_called_once()
+        self.assertIsNone(cache.get(RETENTION_LOCK_KEY))
+
+    @patch('apps.gdpr.tasks.GDPRService.apply_retention_policies')
+    def test_skips_when_locked(self, mock_apply):
+        """Test overlapping run is skipped and leaves the other run's lock alone"""
+        cache.add(RETENTION_LOCK_KEY, 'other-run', 60)
+
+        self.assertIsNone(apply_data_retention_policies())
+        mock_apply.assert_not_called()
+        self.assertEqual(cache.get(RETENTION_LOCK_KEY), 'other-run')
@@ -3,26 +3,112 @@ Data anonymization service for GDPR compliance
 """
 import re
 import hashlib
+import ipaddress
 import logging
 from datetime import datetime
+from functools import lru_cache
+from django.apps import apps
 from django.utils import timezone
-from django.db import models
+from django.db import connection, models, transaction
 from django.conf import settings
 
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    re2 = None
+    RE2_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# anonymize_ip truncation masks: keep the /24 of IPv4 and the /64 of IPv6
+_IPV4_TRUNCATE_MASK = 0xFFFFFF00
+_IPV6_TRUNCATE_MASK = ~((1 << 64) - 1) & ((1 << 128) - 1)
+
+# Text without any of these can't match AnonymizationService.PII_PATTERN
+_PII_REQUIRED_CHARS = '@0123456789'
+
+# Replacement for each named group of AnonymizationService.PII_PATTERN
+PII_REPLACEMENTS = {
+    'EMAIL': '[EMAIL_REMOVED]',
+    'PHONE': '[PHONE_REMOVED]',
+    'SSN': '[SSN_REMOVED]',
+    'CARD': '[CARD_REMOVED]',
+    'IP': '[IP_REMOVED]',
+}
+# Replacement for matches of caller-supplied extra patterns
+EXTRA_PII_REPLACEMENT = '[PII_REMOVED]'
+
+
+# Bound once; hashlib.sha256 is OpenSSL's, which uses SHA-NI where the CPU has it
+_sha256 = hashlib.sha256
+
+
+def _sha256_prefix(value, length=None):
+    """
+    SHA-256 hex digest of value, truncated to length characters
+    Only hex-encodes the bytes that are kept
+    Not memoized: a cache would keep erased PII in process memory
+    """
+    digest = _sha256(value.encode())
+    if not length:
+        return digest.hexdigest()
+    return digest.digest()[:(length + 1) // 2].hex()[:length]
+
+
+def _replace_pii(match):
+    """re.sub callback mapping a PII_PATTERN match to its replacement tag"""
+    return PII_REPLACEMENTS.get(match.lastgroup, EXTRA_PII_REPLACEMENT)
+
+
+@lru_cache(maxsize=128)
+def _compile_pii_pattern(extra_patterns):
+    """
+    PII_PATTERN extended with extra pattern strings, compiled once per tuple of extras
+    Extras come after the built-in patterns, so those still win at the same position
+    """
+    source = '|'.join(
+        [AnonymizationService._PII_SOURCE]
+        + [f'(?P<EXTRA_{index}>{pattern})' for index, pattern in enumerate(extra_patterns)]
+    )
+    return re2.compile(source) if RE2_AVAILABLE else re.compile(source, re.ASCII)
+
 
 class AnonymizationService:
     """
     Service for anonymizing personal data
     """
     
-    # PII patterns for detection in free text
-    EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
-    PHONE_PATTERN = re.compile(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b')
-    SSN_PATTERN = re.compile(r'\b\d{3}-\d{2}-\d{4}\b')
-    CREDIT_CARD_PATTERN = re.compile(r'\b\d{4}[-.\s]?\d{4}[-.\s]?\d{4}[-.\s]?\d{4}\b')
-    IP_PATTERN = re.compile(r'\b(?:\d{1,3}\.){3}\d{1,3}\b')
+    # PII patterns for detection in free text; all ASCII, so \b, \d and \s
+    # skip Unicode character lookups (RE2 classes are ASCII-only already)
+    EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b', re.ASCII)
+    PHONE_PATTERN = re.compile(r'(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b', re.ASCII)
+    SSN_PATTERN = re.compile(r'\b\d{3}-\d{2}-\d{4}\b', re.ASCII)
+    CREDIT_CARD_PATTERN = re.compile(r'\b\d{4}[-.\s]?\d{4}[-.\s]?\d{4}[-.\s]?\d{4}\b', re.ASCII)
+    IP_PATTERN = re.compile(r'\b(?:\d{1,3}\.){3}\d{1,3}\b', re.ASCII)
+    
+    # All of the above as one alternation so text is scanned once; at a given
+    # position earlier alternatives win, matching the old pass order.
+    # Uses RE2's linear-time engine when google-re2 is installed
+    _PII_SOURCE = '|'.join(
+        f'(?P<{name}>{pattern.pattern})'
+        for name, pattern in (
+            ('EMAIL', EMAIL_PATTERN),
+            ('PHONE', PHONE_PATTERN),
+            ('SSN', SSN_PATTERN),
+            ('CARD', CREDIT_CARD_PATTERN),
+            ('IP', IP_PATTERN),
+        )
+    )
+    PII_PATTERN = re2.compile(_PII_SOURCE) if RE2_AVAILABLE else re.compile(_PII_SOURCE, re.ASCII)
+    
+    # Fields each per-record helper overwrites
+    CONTACT_FIELDS = ['email', 'name', 'phone', 'message', 'ip_address']
+    WAITLIST_FIELDS = ['email', 'name']
+    LEAD_FIELDS = ['email', 'first_name', 'last_name', 'phone']
+    NEWSLETTER_FIELDS = ['email', 'name']
+    # Rows per UPDATE statement in anonymize_by_email
+    BULK_UPDATE_BATCH_SIZE = 500
     
     @staticmethod
     def anonymize_email(email, method='hash'):
@@ -39,18 +125,33 @@ class AnonymizationService:
         if not email:
             return None
         
+        # Blank or '@'-less values identify no one; skip normalizing and hashing them
+        if method == 'replace' or email.isspace() or '@' not in email:
+            return "user@anonymous.com"
+        
         email_lower = email.lower().strip()
         
-        if method == 'hash':
-            # Hash email and use as local part
-            email_hash = hashlib.sha256(email_lower.encode()).hexdigest()[:16]
-            return f"user_{email_hash}@anonymous.com"
-        elif method == 'replace':
-            return "user@anonymous.com"
-        else:
-            # Default: hash method
-            email_hash = hashlib.sha256(email_lower.encode()).hexdigest()[:16]
-            return f"user_{email_hash}@anonymous.com"
+        # Default: hash email and use as local part
+        return f"user_{_sha256_prefix(email_lower, 16)}@anonymous.com"
+    
+    @staticmethod
+    def anonymize_emails(emails, method='hash'):
+        """
+        Anonymize many email addresses, hashing each distinct address once
+        
+        Returns:
+            Dict of original email -> anonymized email
+        """
+        by_normalized = {}
+        result = {}
+        for email in emails:
+            if not email or email in result:
+                continue
+            normalized = email.lower().strip()
+            if normalized not in by_normalized:
+                by_normalized[normalized] = AnonymizationService.anonymize_email(normalized, method=method)
+            result[email] = by_normalized[normalized]
+        return result
     
     @staticmethod
     def anonymize_name(name, method='replace'):
@@ -67,11 +168,10 @@ class AnonymizationService:
         if not name:
             return None
         
-        if method == 'replace':
+        if method == 'replace' or name.isspace():
             return "Anonymous User"
         elif method == 'hash':
-            name_hash = hashlib.sha256(name.encode()).hexdigest()[:8]
-            return f"User_{name_hash}"
+            return f"User_{_sha256_prefix(name, 8)}"
         else:
             return "Anonymous User"
     
@@ -87,14 +187,13 @@ class AnonymizationService:
         Returns:
             Anonymized phone (empty string or hashed)
         """
-        if not phone:
+        if not phone or phone.isspace():
             return ""
         
         if method == 'remove':
             return ""
         elif method == 'hash':
-            phone_hash = hashlib.sha256(phone.encode()).hexdigest()[:12]
-            return f"***-***-{phone_hash[:4]}"
+            return f"***-***-{_sha256_prefix(phone, 4)}"
         else:
             return ""
     
@@ -110,39 +209,30 @@ class AnonymizationService:
         Returns:
             Anonymized IP
         """
-        if not ip_address:
+        if not ip_address or ip_address.isspace():
             return None
         
-        if method == 'truncate':
-            # Remove last octet for IPv4
-            if '.' in ip_address:
-                parts = ip_address.split('.')
-                if len(parts) == 4:
-                    return '.'.join(parts[:3]) + '.0'
-            # For IPv6, remove last 64 bits
-            elif ':' in ip_address:
-                parts = ip_address.split(':')
-                if len(parts) >= 4:
-                    return ':'.join(parts[:4]) + '::'
-            return ip_address
-        elif method == 'hash':
+        if method == 'hash':
             # Full hash
-            return hashlib.sha256(ip_address.encode()).hexdigest()
-        else:
-            # Default: truncate
-            if '.' in ip_address:
-                parts = ip_address.split('.')
-                if len(parts) == 4:
-                    return '.'.join(parts[:3]) + '.0'
+            return _sha256_prefix(ip_address)
+        
+        # Default: truncate (zero the last octet for IPv4, the last 64 bits for IPv6)
+        try:
+            address = ipaddress.ip_address(ip_address)
+        except ValueError:
             return ip_address
+        mask = _IPV4_TRUNCATE_MASK if address.version == 4 else _IPV6_TRUNCATE_MASK
+        return str(type(address)(int(address) & mask))
     
     @staticmethod
-    def remove_pii_from_text(text):
+    def remove_pii_from_text(text, extra_patterns=()):
         """
         Remove PII patterns from free text
         
         Args:
             text: Text to clean
+            extra_patterns: Additional regex strings (e.g. deployment-specific IDs),
+                replaced with [PII_REMOVED]
         
         Returns:
             Text with PII patterns removed/replaced
@@ -150,25 +240,19 @@ class AnonymizationService:
         if not text:
             return ""
         
-        # Replace email addresses
-        text = AnonymizationService.EMAIL_PATTERN.sub('[EMAIL_REMOVED]', text)
-        
-        # Replace phone numbers
-        text = AnonymizationService.PHONE_PATTERN.sub('[PHONE_REMOVED]', text)
-        
-        # Replace SSN
-        text = AnonymizationService.SSN_PATTERN.sub('[SSN_REMOVED]', text)
-        
-        # Replace credit card numbers
-        text = AnonymizationService.CREDIT_CARD_PATTERN.sub('[CARD_REMOVED]', text)
+        if extra_patterns:
+            return _compile_pii_pattern(tuple(extra_patterns)).sub(_replace_pii, text)
         
-        # Replace IP addresses
-        text = AnonymizationService.IP_PATTERN.sub('[IP_REMOVED]', text)
+        # Every PII pattern needs an '@' or an ASCII digit; most messages have neither
+        if not any(char in text for char in _PII_REQUIRED_CHARS):
+            return text
         
-        return text
+        # Replace emails, phone numbers, SSNs, credit card numbers and IPs in one pass
+        return AnonymizationService.PII_PATTERN.sub(_replace_pii, text)
     
     @staticmethod
-    def anonymize_contact_submission(contact, reason='GDPR deletion', keep_audit=True):
+    def anonymize_contact_submission(contact, reason='GDPR deletion', keep_audit=True, anonymized_email=None,
+                                     save=True, audit_buffer=None):
         """
         Anonymize a ContactSubmission instance
         
@@ -176,14 +260,15 @@ class AnonymizationService:
             contact: ContactSubmission instance
             reason: Reason for anonymization
             keep_audit: Whether to keep audit trail
+            anonymized_email: Precomputed anonymize_email() result for contact.email
+            save: Save the instance (False when the caller bulk-updates)
+            audit_buffer: List collecting unsaved audit rows for the caller to bulk_create
         
         Returns:
             Anonymized contact instance
         """
-        from apps.contacts.models import ContactSubmission
-        
         # Anonymize fields
-        contact.email = AnonymizationService.anonymize_email(contact.email, method='hash')
+        contact.email = anonymized_email or AnonymizationService.anonymize_email(contact.email, method='hash')
         contact.name = AnonymizationService.anonymize_name(contact.name, method='replace')
         contact.phone = AnonymizationService.anonymize_phone(contact.phone, method='remove')
         contact.message = AnonymizationService.remove_pii_from_text(contact.message)
@@ -193,7 +278,8 @@ class AnonymizationService:
         if contact.ip_address:
             contact.ip_address = AnonymizationService.anonymize_ip(str(contact.ip_address), method='truncate')
         
-        contact.save()
+        if save:
+            contact.save()
         
         # Log anonymization
         if keep_audit:
@@ -201,79 +287,173 @@ class AnonymizationService:
                 model_name='ContactSubmission',
                 instance_id=str(contact.id),
                 reason=reason,
-                fields_anonymized=['email', 'name', 'phone', 'message', 'ip_address']
+                fields_anonymized=AnonymizationService.CONTACT_FIELDS,
+                audit_buffer=audit_buffer
             )
         
         return contact
     
     @staticmethod
-    def anonymize_waitlist_entry(entry, reason='GDPR deletion', keep_audit=True):
+    def anonymize_waitlist_entry(entry, reason='GDPR deletion', keep_audit=True, anonymized_email=None, save=True,
+                                 audit_buffer=None):
         """
         Anonymize a WaitlistEntry instance
         """
-        from apps.waitlist.models import WaitlistEntry
-        
-        entry.email = AnonymizationService.anonymize_email(entry.email, method='hash')
+        entry.email = anonymized_email or AnonymizationService.anonymize_email(entry.email, method='hash')
         entry.name = AnonymizationService.anonymize_name(entry.name, method='replace') if entry.name else None
         
-        entry.save()
+        if save:
+            entry.save()
         
         if keep_audit:
             AnonymizationAudit.log_anonymization(
                 model_name='WaitlistEntry',
                 instance_id=str(entry.id),
                 reason=reason,
-                fields_anonymized=['email', 'name']
+                fields_anonymized=AnonymizationService.WAITLIST_FIELDS,
+                audit_buffer=audit_buffer
             )
         
         return entry
     
     @staticmethod
-    def anonymize_lead(lead, reason='GDPR deletion', keep_audit=True):
+    def anonymize_lead(lead, reason='GDPR deletion', keep_audit=True, anonymized_email=None, save=True,
+                       audit_buffer=None):
         """
         Anonymize a Lead instance
         """
-        from apps.leads.models import Lead
-        
-        lead.email = AnonymizationService.anonymize_email(lead.email, method='hash')
+        lead.email = anonymized_email or AnonymizationService.anonymize_email(lead.email, method='hash')
         lead.first_name = AnonymizationService.anonymize_name(lead.first_name, method='replace') if lead.first_name else None
         lead.last_name = AnonymizationService.anonymize_name(lead.last_name, method='replace') if lead.last_name else None
         lead.phone = AnonymizationService.anonymize_phone(lead.phone, method='remove') if lead.phone else None
         
-        lead.save()
+        if save:
+            lead.save()
         
         if keep_audit:
             AnonymizationAudit.log_anonymization(
                 model_name='Lead',
                 instance_id=str(lead.id),
                 reason=reason,
-                fields_anonymized=['email', 'first_name', 'last_name', 'phone']
+                fields_anonymized=AnonymizationService.LEAD_FIELDS,
+                audit_buffer=audit_buffer
             )
         
         return lead
     
     @staticmethod
-    def anonymize_newsletter_subscription(subscription, reason='GDPR deletion', keep_audit=True):
+    def anonymize_newsletter_subscription(subscription, reason='GDPR deletion', keep_audit=True, anonymized_email=None,
+                                          save=True, audit_buffer=None):
         """
         Anonymize a NewsletterSubscription instance
         """
-        from apps.newsletter.models import NewsletterSubscription
-        
-        subscription.email = AnonymizationService.anonymize_email(subscription.email, method='hash')
+        subscription.email = anonymized_email or AnonymizationService.anonymize_email(subscription.email, method='hash')
         subscription.name = AnonymizationService.anonymize_name(subscription.name, method='replace') if subscription.name else None
         
-        subscription.save()
+        if save:
+            subscription.save()
         
         if keep_audit:
             AnonymizationAudit.log_anonymization(
                 model_name='NewsletterSubscription',
                 instance_id=str(subscription.id),
                 reason=reason,
-                fields_anonymized=['email', 'name']
+                fields_anonymized=AnonymizationService.NEWSLETTER_FIELDS,
+                audit_buffer=audit_buffer
             )
         
         return subscription
     
+    @staticmethod
+    def _email_sweeps():
+        """
+        Models anonymize_by_email covers
+        Returns: dict of summary key -> (model label, record anonymizer, fields)
+        """
+        return {
+            'contacts': ('contacts.ContactSubmission',
+                         AnonymizationService.anonymize_contact_submission, AnonymizationService.CONTACT_FIELDS),
+            'waitlist': ('waitlist.WaitlistEntry',
+                         AnonymizationService.anonymize_waitlist_entry, AnonymizationService.WAITLIST_FIELDS),
+            'leads': ('leads.Lead',
+                      AnonymizationService.anonymize_lead, AnonymizationService.LEAD_FIELDS),
+            'newsletter': ('newsletter.NewsletterSubscription',
+                           AnonymizationService.anonymize_newsletter_subscription,
+                           AnonymizationService.NEWSLETTER_FIELDS),
+        }
+    
+    @staticmethod
+    def _bulk_anonymize(queryset, anonymize, fields, reason, keep_audit, anonymized_email=None):
+        """
+        Anonymize queryset rows in memory and save them with bulk_update
+        Rows are streamed and written in BULK_UPDATE_BATCH_SIZE chunks, so memory
+        stays bounded; only the anonymized columns are loaded, and rows stay locked
+        until written. bulk_update skips save(), so updated_at is set here
+        Without anonymized_email, each distinct email in a batch is hashed once;
+        audit rows are inserted with one bulk_create per batch
+        Returns: number of rows anonymized
+        """
+        from apps.gdpr.models import DataDeletionAudit
+        
+        batch_size = AnonymizationService.BULK_UPDATE_BATCH_SIZE
+        manager = queryset.model.objects
+        now = timezone.now()
+        
+        def write(batch):
+            emails = {} if anonymized_email else AnonymizationService.anonymize_emails(row.email for row in batch)
+            audits = []
+            for row in batch:
+                anonymize(row, reason, keep_audit, anonymized_email or emails.get(row.email), save=False,
+                          audit_buffer=audits)
+                row.updated_at = now
+            manager.bulk_update(batch, fields + ['updated_at'])
+            if audits:
+                DataDeletionAudit.objects.bulk_create(audits)
+            return len(batch)
+        
+        count = 0
+        batch = []
+        with transaction.atomic():
+            # Wait for locks rather than skip_locked: a skipped row would keep its PII
+            rows = queryset.only(*fields).select_for_update().iterator(chunk_size=batch_size)
+            for row in rows:
+                batch.append(row)
+                if len(batch) == batch_size:
+                    count += write(batch)
+                    batch = []
+            if batch:
+                count += write(batch)
+        return count
+    
+    @staticmethod
+    def anonymize_queryset(key, queryset, reason='GDPR deletion', keep_audit=True):
+        """
+        Bulk-anonymize arbitrary rows of a model covered by anonymize_by_email
+        (e.g. a retention policy's expired rows)
+        Returns: number of rows anonymized
+        """
+        _, anonymize, fields = AnonymizationService._email_sweeps()[key]
+        return AnonymizationService._bulk_anonymize(queryset, anonymize, fields, reason, keep_audit)
+    
+    @staticmethod
+    def _models_with_email(email_lower):
+        """
+        Find which models have rows for an email in a single round trip
+        (UNION ALL of one EXISTS probe per model, compiled by the ORM)
+        Returns: set of _email_sweeps() keys with matching rows
+        """
+        parts = []
+        params = []
+        for key, (model_label, _, _) in AnonymizationService._email_sweeps().items():
+            probe = apps.get_model(model_label).objects.filter(email__iexact=email_lower).order_by().values('pk')
+            sql, probe_params = probe.query.sql_with_params()
+            parts.append(f"SELECT %s WHERE EXISTS ({sql})")
+            params.extend([key, *probe_params])
+        
+        with connection.cursor() as cursor:
+            cursor.execute(' UNION ALL '.join(parts), params)
+            return {row[0] for row in cursor.fetchall()}
+    
     @staticmethod
     def anonymize_by_email(email, reason='GDPR deletion', keep_audit=True):
         """
@@ -288,6 +468,8 @@ class AnonymizationService:
             Dict with anonymization summary
         """
         email_lower = email.lower().strip()
+        # Every matched row has this email (case-insensitively), so hash it once
+        anonymized_email = AnonymizationService.anonymize_email(email_lower, method='hash')
         summary = {
             'email': email_lower,
             'anonymized_at': timezone.now().isoformat(),
@@ -295,54 +477,80 @@ class AnonymizationService:
             'records_anonymized': {}
         }
         
-        # Anonymize contact submissions
+        # Each model's rows are anonymized in memory, then written with batched UPDATEs;
+        # models without the email are skipped after one combined existence probe
+        sweeps = AnonymizationService._email_sweeps()
         try:
-            from apps.contacts.models import ContactSubmission
-            contacts = ContactSubmission.objects.filter(email__iexact=email_lower)
-            count = contacts.count()
-            for contact in contacts:
-                AnonymizationService.anonymize_contact_submission(contact, reason, keep_audit)
-            summary['records_anonymized']['contacts'] = count
+            present = AnonymizationService._models_with_email(email_lower)
         except Exception as e:
-            logger.error(f"Error anonymizing contacts: {str(e)}")
-            summary['records_anonymized']['contacts'] = 0
+            logger.error("Error probing records for anonymization: %s", e)
+            present = set(sweeps)
+        
+        for key, (model_label, anonymize, fields) in sweeps.items():
+            if key not in present:
+                summary['records_anonymized'][key] = 0
+                continue
+            try:
+                queryset = apps.get_model(model_label).objects.filter(email__iexact=email_lower)
+                summary['records_anonymized'][key] = AnonymizationService._bulk_anonymize(
+                    queryset, anonymize, fields, reason, keep_audit, anonymized_email
+                )
+            except Exception as e:
+                logger.error("Error anonymizing %s: %s", key, e)
+                summary['records_anonymized'][key] = 0
         
-        # Anonymize waitlist entries
-        try:
-            from apps.waitlist.models import WaitlistEntry
-            entries = WaitlistEntry.objects.filter(email__iexact=email_lower)
-            count = entries.count()
-            for entry in entries:
-                AnonymizationService.anonymize_waitlist_entry(entry, reason, keep_audit)
-            summary['records_anonymized']['waitlist'] = count
-        except Exception as e:
-            logger.error(f"Error anonymizing waitlist: {str(e)}")
-            summary['records_anonymized']['waitlist'] = 0
+        return summary
+    
+    @staticmethod
+    def anonymize_records(key, ids, email, reason='GDPR deletion', keep_audit=True):
+        """
+        Anonymize one primary-key slice of a model covered by anonymize_by_email
+        Rows whose email no longer matches (already anonymized) are skipped, so retries are safe
+        Returns: number of rows anonymized
+        """
+        model_label, anonymize, fields = AnonymizationService._email_sweeps()[key]
+        email_lower = email.lower().strip()
+        queryset = apps.get_model(model_label).objects.filter(pk__in=ids, email__iexact=email_lower)
+        return AnonymizationService._bulk_anonymize(
+            queryset, anonymize, fields, reason, keep_audit,
+            AnonymizationService.anonymize_email(email_lower, method='hash')
+        )
+    
+    @staticmethod
+    def anonymize_by_email_async(email, reason='GDPR deletion', keep_audit=True, chunk_size=None):
+        """
+        Queue anonymize_by_email as Celery tasks, one per primary-key chunk per model
+        Workers anonymize disjoint slices in parallel; nothing waits for them here
         
-        # Anonymize leads
-        try:
-            from apps.leads.models import Lead
-            leads = Lead.objects.filter(email__iexact=email_lower)
-            count = leads.count()
-            for lead in leads:
-                AnonymizationService.anonymize_lead(lead, reason, keep_audit)
-            summary['records_anonymized']['leads'] = count
-        except Exception as e:
-            logger.error(f"Error anonymizing leads: {str(e)}")
-            summary['records_anonymized']['leads'] = 0
+        Returns:
+            Dict with the number of records queued per model
+        """
+        from celery import group
+        from .tasks import anonymize_records_task
         
-        # Anonymize newsletter subscriptions
-        try:
-            from apps.newsletter.models import NewsletterSubscription
-            subscriptions = NewsletterSubscription.objects.filter(email__iexact=email_lower)
-            count = subscriptions.count()
-            for subscription in subscriptions:
-                AnonymizationService.anonymize_newsletter_subscription(subscription, reason, keep_audit)
-            summary['records_anonymized']['newsletter'] = count
-        except Exception as e:
-            logger.error(f"Error anonymizing newsletter: {str(e)}")
-            summary['records_anonymized']['newsletter'] = 0
+        chunk_size = chunk_size or AnonymizationService.BULK_UPDATE_BATCH_SIZE
+        email_lower = email.lower().strip()
+        summary = {
+            'email': email_lower,
+            'queued_at': timezone.now().isoformat(),
+            'reason': reason,
+            'records_queued': {}
+        }
+        
+        signatures = []
+        for key, (model_label, _, _) in AnonymizationService._email_sweeps().items():
+            ids = [
+                str(pk) for pk in
+                apps.get_model(model_label).objects.filter(email__iexact=email_lower).values_list('pk', flat=True)
+            ]
+            summary['records_queued'][key] = len(ids)
+            signatures.extend(
+                anonymize_records_task.s(key, ids[start:start + chunk_size], email_lower, reason, keep_audit)
+                for start in range(0, len(ids), chunk_size)
+            )
         
+        if signatures:
+            group(signatures).apply_async()
         return summary
 
 
@@ -353,7 +561,7 @@ class AnonymizationAudit:
     
     @staticmethod
     def log_anonymization(model_name, instance_id, reason, fields_anonymized, 
-                         anonymized_by=None, ip_address=None):
+                         anonymized_by=None, ip_address=None, audit_buffer=None):
         """
         Log anonymization operation
         
@@ -364,6 +572,8 @@ class AnonymizationAudit:
             fields_anonymized: List of field names that were anonymized
             anonymized_by: Who initiated anonymization
             ip_address: IP address (will be hashed)
+            audit_buffer: If given, the unsaved audit record is appended here
+                          instead of being inserted
         """
         try:
             from apps.gdpr.models import DataDeletionAudit
@@ -371,10 +581,10 @@ class AnonymizationAudit:
             # Hash IP if provided
             ip_hash = None
             if ip_address:
-                ip_hash = hashlib.sha256(ip_address.encode()).hexdigest()
+                ip_hash = _sha256_prefix(ip_address)
             
             # Create audit record
-            audit = DataDeletionAudit.objects.create(
+            audit = DataDeletionAudit(
                 email=f"anonymized_{instance_id}@audit.local",  # Placeholder
                 deletion_type='anonymize',
                 data_types_deleted=[model_name],
@@ -388,11 +598,15 @@ class AnonymizationAudit:
                     'anonymization_timestamp': timezone.now().isoformat(),
                 }
             )
+            if audit_buffer is None:
+                audit.save()
+            else:
+                audit_buffer.append(audit)
             
-            logger.info(f"Anonymization logged: {model_name} {instance_id} - {reason}")
+            logger.info("Anonymization logged: %s %s - %s", model_name, instance_id, reason)
             return audit
         except Exception as e:
-            logger.error(f"Error logging anonymization: {str(e)}")
+            logger.error("Error logging anonymization: %s", e)
             return None
     
     @staticmethod
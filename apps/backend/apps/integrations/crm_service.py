@@ -3,11 +3,37 @@ CRM integration service supporting multiple providers
 """
 from abc import ABC, abstractmethod
 from django.conf import settings
+from django.core.cache import cache
 import logging
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from .tasks import sync_to_crm_task
 
 logger = logging.getLogger(__name__)
 
 
+def _build_http_session():
+    """
+    Shared keep-alive session for CRM REST calls
+    Retries connection errors and throttling/gateway responses; urllib3's default
+    allowed_methods leave POST out, so creates are never sent twice
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=64,
+        max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 502, 503, 504]),
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+_HTTP_SESSION = _build_http_session()
+
+
 class CRMProvider(ABC):
     """
     Abstract base class for CRM providers
@@ -42,6 +68,18 @@ class CRMProvider(ABC):
     def search_contact(self, email):
         """Search for contact by email"""
         pass
+    
+    def bulk_create_contacts(self, contacts_data):
+        """
+        Create many contacts in CRM
+        Providers with a batch endpoint override this; the default creates one by one
+        """
+        results = []
+        for contact_data in contacts_data:
+            result = self.create_contact(contact_data)
+            if result:
+                results.append(result)
+        return results
 
 
 class HubSpotCRMProvider(CRMProvider):
@@ -53,20 +91,18 @@ class HubSpotCRMProvider(CRMProvider):
         from .hubspot_service import hubspot_service
         self.service = hubspot_service
     
-    def create_contact(self, contact_data):
-        """Create contact in HubSpot"""
-        return self.service.create_contact(contact_data)
+    def create_contact(self, contact_data, tags=None):
+        """Create contact in HubSpot, tagged in the same request"""
+        return self.service.create_contact(contact_data, tags=tags)
     
     def update_contact(self, contact_id, contact_data):
         """Update contact in HubSpot"""
         return self.service.update_contact(contact_id, contact_data)
     
-    def create_lead(self, lead_data):
+    def create_lead(self, lead_data, tags=None):
         """Create lead in HubSpot (as contact with lead status)"""
-        # Add lead status property
-        lead_data_with_status = lead_data.copy()
-        lead_data_with_status['hs_lead_status'] = 'NEW'
-        return self.service.create_contact(lead_data_with_status)
+        # Add lead status property without touching the caller's dict
+        return self.service.create_contact({**lead_data, 'hs_lead_status': 'NEW'}, tags=tags)
     
     def create_deal(self, deal_data):
         """Create deal in HubSpot"""
@@ -81,6 +117,10 @@ class HubSpotCRMProvider(CRMProvider):
         """Search contact by email in HubSpot"""
         result = self.service.search_contact_by_email(email)
         return [result] if result else []
+    
+    def bulk_create_contacts(self, contacts_data):
+        """Create contacts in HubSpot via the batch API"""
+        return self.service.batch_create_contacts(contacts_data)
 
 
 class SalesforceCRMProvider(CRMProvider):
@@ -88,35 +128,65 @@ class SalesforceCRMProvider(CRMProvider):
     Salesforce CRM integration
     """
     
+    # Seconds to reuse a login; sessions that expire sooner are refreshed on demand
+    SESSION_TTL = 3300
+    
     def __init__(self):
         self.username = getattr(settings, 'SALESFORCE_USERNAME', '')
         self.password = getattr(settings, 'SALESFORCE_PASSWORD', '')
         self.security_token = getattr(settings, 'SALESFORCE_SECURITY_TOKEN', '')
         self.sandbox = getattr(settings, 'SALESFORCE_SANDBOX', False)
+        self._sf = None
+        self._sf_expires_at = 0
         if not all([self.username, self.password]):
             logger.warning("Salesforce credentials not configured")
     
-    def _get_connection(self):
-        """Get Salesforce connection"""
+    def _get_connection(self, refresh=False):
+        """
+        Get Salesforce connection
+        The login is cached on the provider and reused until SESSION_TTL passes
+        """
+        if not refresh and self._sf and time.monotonic() < self._sf_expires_at:
+            return self._sf
+        
+        self._sf = None
         try:
             from simple_salesforce import Salesforce
-            return Salesforce(
+            self._sf = Salesforce(
                 username=self.username,
                 password=self.password,
                 security_token=self.security_token,
-                sandbox=self.sandbox
+                sandbox=self.sandbox,
+                session=_HTTP_SESSION
             )
+            self._sf_expires_at = time.monotonic() + self.SESSION_TTL
+            return self._sf
         except Exception as e:
             logger.error(f"Salesforce connection error: {str(e)}")
             return None
     
-    def create_contact(self, contact_data):
-        """Create contact in Salesforce"""
+    def _call(self, operation):
+        """
+        Run operation(sf) on the cached connection, logging in again once if
+        Salesforce reports the session expired
+        Returns: operation result, or None without a connection
+        """
+        sf = self._get_connection()
+        if not sf:
+            return None
+        
+        from simple_salesforce.exceptions import SalesforceExpiredSession
         try:
-            sf = self._get_connection()
+            return operation(sf)
+        except SalesforceExpiredSession:
+            sf = self._get_connection(refresh=True)
             if not sf:
                 return None
-            
+            return operation(sf)
+    
+    def create_contact(self, contact_data):
+        """Create contact in Salesforce"""
+        try:
             contact = {
                 'FirstName': contact_data.get('first_name', ''),
                 'LastName': contact_data.get('last_name', ''),
@@ -125,8 +195,7 @@ class SalesforceCRMProvider(CRMProvider):
                 'Company__c': contact_data.get('company', ''),
             }
             
-            result = sf.Contact.create(contact)
-            return result
+            return self._call(lambda sf: sf.Contact.create(contact))
         except Exception as e:
             logger.error(f"Salesforce create_contact error: {str(e)}")
             return None
@@ -134,18 +203,13 @@ class SalesforceCRMProvider(CRMProvider):
     def update_contact(self, contact_id, contact_data):
         """Update contact in Salesforce"""
         try:
-            sf = self._get_connection()
-            if not sf:
-                return None
-            
             contact = {
                 'FirstName': contact_data.get('first_name', ''),
                 'LastName': contact_data.get('last_name', ''),
                 'Email': contact_data.get('email', ''),
             }
             
-            result = sf.Contact.update(contact_id, contact)
-            return result
+            return self._call(lambda sf: sf.Contact.update(contact_id, contact))
         except Exception as e:
             logger.error(f"Salesforce update_contact error: {str(e)}")
             return None
@@ -153,10 +217,6 @@ class SalesforceCRMProvider(CRMProvider):
     def create_lead(self, lead_data):
         """Create lead in Salesforce"""
         try:
-            sf = self._get_connection()
-            if not sf:
-                return None
-            
             lead = {
                 'FirstName': lead_data.get('first_name', ''),
                 'LastName': lead_data.get('last_name', ''),
@@ -165,8 +225,7 @@ class SalesforceCRMProvider(CRMProvider):
                 'Status': 'Open - Not Contacted',
             }
             
-            result = sf.Lead.create(lead)
-            return result
+            return self._call(lambda sf: sf.Lead.create(lead))
         except Exception as e:
             logger.error(f"Salesforce create_lead error: {str(e)}")
             return None
@@ -174,10 +233,6 @@ class SalesforceCRMProvider(CRMProvider):
     def create_deal(self, deal_data):
         """Create opportunity in Salesforce"""
         try:
-            sf = self._get_connection()
-            if not sf:
-                return None
-            
             opportunity = {
                 'Name': deal_data.get('name', ''),
                 'Amount': deal_data.get('value', ''),
@@ -185,8 +240,7 @@ class SalesforceCRMProvider(CRMProvider):
                 'CloseDate': deal_data.get('close_date', ''),
             }
             
-            result = sf.Opportunity.create(opportunity)
-            return result
+            return self._call(lambda sf: sf.Opportunity.create(opportunity))
         except Exception as e:
             logger.error(f"Salesforce create_deal error: {str(e)}")
             return None
@@ -194,17 +248,12 @@ class SalesforceCRMProvider(CRMProvider):
     def create_note(self, entity_id, note_content):
         """Create note in Salesforce"""
         try:
-            sf = self._get_connection()
-            if not sf:
-                return None
-            
             note = {
                 'Body': note_content,
                 'ParentId': entity_id,
             }
             
-            result = sf.Note.create(note)
-            return result
+            return self._call(lambda sf: sf.Note.create(note))
         except Exception as e:
             logger.error(f"Salesforce create_note error: {str(e)}")
             return None
@@ -212,13 +261,11 @@ class SalesforceCRMProvider(CRMProvider):
     def search_contact(self, email):
         """Search contact by email in Salesforce"""
         try:
-            sf = self._get_connection()
-            if not sf:
-                return []
-            
-            query = f"SELECT Id, Name, Email FROM Contact WHERE Email = '{email}'"
-            result = sf.query(query)
-            return result.get('records', [])
+            from simple_salesforce import format_soql
+            # format_soql quotes and escapes the value; Email matches case-insensitively
+            query = format_soql("SELECT Id, Name, Email FROM Contact WHERE Email = {}", email.strip().lower())
+            result = self._call(lambda sf: sf.query(query))
+            return result.get('records', []) if result else []
         except Exception as e:
             logger.error(f"Salesforce search_contact error: {str(e)}")
             return []
@@ -238,16 +285,15 @@ class PipedriveCRMProvider(CRMProvider):
     def _make_request(self, method, endpoint, data=None):
         """Make API request to Pipedrive"""
         try:
-            import requests
             url = f"{self.base_url}/{endpoint}"
             params = {'api_token': self.api_token}
             
             if method == 'GET':
-                response = requests.get(url, params=params, timeout=10)
+                response = _HTTP_SESSION.get(url, params=params, timeout=10)
             elif method == 'POST':
-                response = requests.post(url, params=params, json=data, timeout=10)
+                response = _HTTP_SESSION.post(url, params=params, json=data, timeout=10)
             elif method == 'PUT':
-                response = requests.put(url, params=params, json=data, timeout=10)
+                response = _HTTP_SESSION.put(url, params=params, json=data, timeout=10)
             
             response.raise_for_status()
             return response.json()
@@ -307,6 +353,9 @@ class CRMService:
     Unified CRM service that routes to the configured provider
     """
     
+    # Seconds a synced status change is remembered, so replays are not re-sent
+    STATUS_SYNC_DEDUP_TIMEOUT = 300
+    
     def __init__(self):
         self.provider_name = getattr(settings, 'CRM_PROVIDER', '').lower()
         self.provider = self._get_provider()
@@ -329,12 +378,17 @@ class CRMService:
         if not self.field_mapping:
             return data
         
-        mapped_data = {}
-        for key, value in data.items():
-            mapped_key = self.field_mapping.get(key, key)
-            mapped_data[mapped_key] = value
-        
-        return mapped_data
+        field_mapping = self.field_mapping
+        return {field_mapping.get(key, key): value for key, value in data.items()}
+    
+    def _create_kwargs(self, source):
+        """
+        Extra create_contact/create_lead arguments: on HubSpot the source tag is
+        set in the create request rather than by a separate tag_contact call
+        """
+        if self.provider_name != 'hubspot' or not source:
+            return {}
+        return {'tags': [f"source_{source.replace(' ', '_').lower()}"]}
     
     def sync_contact_submission(self, contact_submission, immediate=True):
         """
@@ -347,7 +401,6 @@ class CRMService:
         if not immediate:
             # Queue for batch sync via Celery
             try:
-                from .tasks import sync_to_crm_task
                 sync_to_crm_task.delay('contact', str(contact_submission.id))
                 return True
             except Exception as e:
@@ -365,7 +418,9 @@ class CRMService:
                 }
                 
                 mapped_data = self._map_fields(contact_data)
-                result = self.provider.create_contact(mapped_data)
+                result = self.provider.create_contact(
+                    mapped_data, **self._create_kwargs(contact_submission.source)
+                )
                 
                 if result:
                     # Extract contact ID
@@ -378,12 +433,6 @@ class CRMService:
                         # Create note with message
                         note = f"Subject: {contact_submission.subject}\n\n{contact_submission.message}"
                         self.provider.create_note(contact_id, note)
-                        
-                        # Tag contact based on source
-                        if self.provider_name == 'hubspot' and contact_submission.source:
-                            from .hubspot_service import hubspot_service
-                            source_tag = f"source_{contact_submission.source.replace(' ', '_').lower()}"
-                            hubspot_service.tag_contact(contact_id, [source_tag])
                     
                     logger.info(f"Contact synced to CRM: {contact_submission.email}")
                     return True
@@ -402,7 +451,6 @@ class CRMService:
         if not immediate:
             # Queue for batch sync via Celery
             try:
-                from .tasks import sync_to_crm_task
                 sync_to_crm_task.delay('waitlist', str(waitlist_entry.id))
                 return True
             except Exception as e:
@@ -418,21 +466,9 @@ class CRMService:
                 }
                 
                 mapped_data = self._map_fields(lead_data)
-                result = self.provider.create_lead(mapped_data)
+                result = self.provider.create_lead(mapped_data, **self._create_kwargs(waitlist_entry.source))
                 
                 if result:
-                    # Extract contact ID
-                    if isinstance(result, dict):
-                        contact_id = result.get('id')
-                    else:
-                        contact_id = result
-                    
-                    # Tag based on source
-                    if self.provider_name == 'hubspot' and waitlist_entry.source:
-                        from .hubspot_service import hubspot_service
-                        source_tag = f"source_{waitlist_entry.source.replace(' ', '_').lower()}"
-                        hubspot_service.tag_contact(contact_id, [source_tag])
-                    
                     logger.info(f"Waitlist entry synced to CRM: {waitlist_entry.email}")
                     return True
             except Exception as e:
@@ -450,7 +486,6 @@ class CRMService:
         if not immediate:
             # Queue for batch sync via Celery
             try:
-                from .tasks import sync_to_crm_task
                 sync_to_crm_task.delay('lead', str(lead.id))
                 return True
             except Exception as e:
@@ -468,7 +503,7 @@ class CRMService:
                 }
                 
                 mapped_data = self._map_fields(lead_data)
-                result = self.provider.create_lead(mapped_data)
+                result = self.provider.create_lead(mapped_data, **self._create_kwargs(lead.lead_source))
                 
                 if result:
                     # Extract contact ID
@@ -479,19 +514,12 @@ class CRMService:
                     
                     # Create deal for qualified leads
                     if lead.status == 'qualified' and self.provider_name == 'hubspot':
-                        from .hubspot_service import hubspot_service
                         deal_data = {
                             'name': f"Deal for {lead.first_name} {lead.last_name}",
                             'value': None,  # Can be set if available
                             'stage': 'qualifiedtobuy',
                         }
-                        hubspot_service.create_deal(deal_data, associated_contact_id=contact_id)
-                    
-                    # Tag based on source
-                    if self.provider_name == 'hubspot' and lead.lead_source:
-                        from .hubspot_service import hubspot_service
-                        source_tag = f"source_{lead.lead_source.replace(' ', '_').lower()}"
-                        hubspot_service.tag_contact(contact_id, [source_tag])
+                        self.provider.service.create_deal(deal_data, associated_contact_id=contact_id)
                     
                     logger.info(f"Lead synced to CRM: {lead.email}")
                     return True
@@ -499,33 +527,48 @@ class CRMService:
                 logger.error(f"CRM sync error for lead: {str(e)}")
         return False
     
-    def sync_status_change(self, entity_type, entity_id, new_status, immediate=True):
+    def sync_status_change(self, entity_type, entity_id, new_status, immediate=True,
+                           previous_status=None, event_id=None):
         """
         Sync status change to CRM
         Creates timeline note and updates properties if needed
+        The same change repeated within STATUS_SYNC_DEDUP_TIMEOUT (retries,
+        webhook replays) is skipped; pass event_id (e.g. the change timestamp)
+        so a genuine A->B->A->B sequence is not mistaken for a replay
         """
         if not self.provider:
             return False
         
+        dedup_key = (
+            f"crm_status_sync_{entity_type}_{entity_id}_{previous_status}_{new_status}_{event_id}"
+        )
+        if not cache.add(dedup_key, 1, timeout=self.STATUS_SYNC_DEDUP_TIMEOUT):
+            logger.info(f"Status change already synced to CRM: {entity_type} {entity_id}")
+            return True
+        
         try:
             note = f"Status changed to: {new_status}"
             result = self.provider.create_note(entity_id, note)
+            # Providers log and return None on failure instead of raising
+            if not result:
+                raise ValueError(f"CRM did not accept the status note for {entity_type} {entity_id}")
             
             # For qualified leads, create deal in HubSpot
             if new_status == 'qualified' and entity_type == 'lead' and self.provider_name == 'hubspot':
-                from .hubspot_service import hubspot_service
                 # Get lead data (would need to fetch from database)
                 # This is a simplified version
                 deal_data = {
                     'name': f"Qualified Lead Deal",
                     'stage': 'qualifiedtobuy',
                 }
-                hubspot_service.create_deal(deal_data, associated_contact_id=entity_id)
+                self.provider.service.create_deal(deal_data, associated_contact_id=entity_id)
             
             logger.info(f"Status change synced to CRM: {entity_type} {entity_id}")
             return True
         except Exception as e:
             logger.error(f"CRM sync error for status change: {str(e)}")
+        # Let a retry of the failed sync through
+        cache.delete(dedup_key)
         return False
 
 
@@ -1,11 +1,15 @@
 """
 Email service supporting multiple providers
 """
+from contextlib import contextmanager
+from functools import cached_property
+from smtplib import SMTPServerDisconnected
 from django.conf import settings
-from django.core.mail import send_mail, EmailMultiAlternatives
+from django.core.mail import get_connection, send_mail, EmailMultiAlternatives
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +23,31 @@ class EmailService:
         self.backend = getattr(settings, 'EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
         self.from_email = getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@example.com')
         self.frontend_url = getattr(settings, 'FRONTEND_URL', 'http://localhost:3000')
+        # Per-thread connection opened by batch_connection(); the instance is shared
+        self._local = threading.local()
+    
+    @contextmanager
+    def batch_connection(self):
+        """
+        Reuse one open mail connection for every synchronous send in the block,
+        instead of a connect/TLS/login per email (e.g. admin bulk actions)
+        Only sends with use_celery=False use it; queued sends connect in the worker
+        Falls back to per-email connections if the connection cannot be opened
+        """
+        connection = get_connection()
+        try:
+            connection.open()
+        except Exception as e:
+            logger.error(f"Failed to open mail connection: {str(e)}")
+            yield None
+            return
+        
+        self._local.connection = connection
+        try:
+            yield connection
+        finally:
+            self._local.connection = None
+            connection.close()
     
     def send_email(self, subject, to_email, template_name, context, use_celery=True):
         """
@@ -46,21 +75,33 @@ class EmailService:
                 text_content = strip_tags(html_content)
             
             # Send email
-            if use_celery and self._is_celery_available():
+            if use_celery and self._celery_available:
                 # Use Celery task for async sending
                 from .tasks import send_email_task
                 send_email_task.delay(subject, to_email, html_content, text_content)
                 return True
             else:
                 # Send synchronously
+                connection = getattr(self._local, 'connection', None)
                 msg = EmailMultiAlternatives(
                     subject=subject,
                     body=text_content,
                     from_email=self.from_email,
-                    to=[to_email]
+                    to=[to_email],
+                    connection=connection
                 )
                 msg.attach_alternative(html_content, "text/html")
-                msg.send()
+                try:
+                    msg.send()
+                except SMTPServerDisconnected:
+                    if connection is None:
+                        raise
+                    # The shared batch connection dropped; reopen it once so the
+                    # rest of the batch does not fail with it
+                    logger.warning("Mail connection dropped, reconnecting")
+                    connection.close()
+                    connection.open()
+                    msg.send()
                 return True
         
         except Exception as e:
@@ -183,6 +224,14 @@ class EmailService:
             context=context
         )
     
+    @cached_property
+    def _celery_available(self):
+        """
+        Celery availability, checked on the first send (by then the project's
+        Celery app is configured) and fixed for the process lifetime
+        """
+        return self._is_celery_available()
+    
     def _is_celery_available(self):
         """Check if Celery is available"""
         try:
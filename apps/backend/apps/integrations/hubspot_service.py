@@ -1,6 +1,7 @@
 """
 Enhanced HubSpot integration service
 """
+import threading
 import time
 import logging
 from django.conf import settings
@@ -32,6 +33,10 @@ class HubSpotService:
     Enhanced HubSpot integration with rate limiting, batching, and retry logic
     """
     
+    # HubSpot-defined association type IDs
+    NOTE_TO_CONTACT_ASSOCIATION = 202
+    DEAL_TO_CONTACT_ASSOCIATION = 3
+    
     def __init__(self):
         if not HUBSPOT_AVAILABLE:
             logger.warning("HubSpot API client not installed")
@@ -52,21 +57,33 @@ class HubSpotService:
                 logger.error(f"Failed to initialize HubSpot client: {str(e)}")
                 self.client = None
         
-        # Rate limit handling
-        self.last_request_time = 0
-        self.min_request_interval = 0.1  # 100ms between requests (10 requests/second)
+        # Rate limit handling: token bucket, bursts of up to rate_limit_burst
+        # requests, refilled at one token per min_request_interval
+        self._rate_limit_lock = threading.Lock()
+        self.min_request_interval = 0.1  # 10 requests/second on average
+        self.rate_limit_burst = 10
+        self._rate_tokens = self.rate_limit_burst
+        self._rate_updated_at = time.monotonic()
         self.batch_size = 100
     
     def _handle_rate_limit(self):
-        """Handle rate limiting by adding delays between requests"""
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
+        """
+        Handle rate limiting by taking a token from the bucket
+        Only sleeps once a burst has used up the bucket; a caller that finds it
+        empty reserves the next token under the lock and waits for it
+        """
+        if self.min_request_interval <= 0:
+            return
         
-        if time_since_last_request < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last_request
-            time.sleep(sleep_time)
+        with self._rate_limit_lock:
+            now = time.monotonic()
+            refilled = (now - self._rate_updated_at) / self.min_request_interval
+            self._rate_tokens = min(self.rate_limit_burst, self._rate_tokens + refilled) - 1
+            self._rate_updated_at = now
+            wait = -self._rate_tokens * self.min_request_interval if self._rate_tokens < 0 else 0
         
-        self.last_request_time = time.time()
+        if wait:
+            time.sleep(wait)
     
     def _map_fields(self, data, field_type='contact'):
         """
@@ -86,6 +103,16 @@ class HubSpotService:
         
         return mapped_data
     
+    @staticmethod
+    def _contact_associations(contact_id, association_type_id):
+        """Inline associations for a create request, linking the new object to a contact"""
+        if not contact_id:
+            return []
+        return [{
+            'to': {'id': contact_id},
+            'types': [{'associationCategory': 'HUBSPOT_DEFINED', 'associationTypeId': association_type_id}],
+        }]
+    
     def _split_name(self, name):
         """Split full name into first_name and last_name"""
         if not name:
@@ -98,10 +125,38 @@ class HubSpotService:
             return parts[0], ' '.join(parts[1:])
         return '', ''
     
-    def create_contact(self, contact_data, retry_count=3):
+    def _contact_properties(self, contact_data):
+        """
+        Build HubSpot contact properties
+        Maps name → first_name/last_name
+        """
+        # Split name into first_name and last_name
+        name = contact_data.get('name', '') or f"{contact_data.get('first_name', '')} {contact_data.get('last_name', '')}".strip()
+        if name and not contact_data.get('first_name'):
+            first_name, last_name = self._split_name(name)
+            contact_data['first_name'] = first_name
+            contact_data['last_name'] = last_name
+        
+        # Map fields
+        properties = {
+            'email': contact_data.get('email', ''),
+            'firstname': contact_data.get('first_name', ''),
+            'lastname': contact_data.get('last_name', ''),
+            'phone': contact_data.get('phone', ''),
+            'company': contact_data.get('company', ''),
+        }
+        
+        # Apply custom field mapping
+        mapped_properties = self._map_fields(properties, 'contact')
+        
+        # Remove empty values
+        return {k: v for k, v in mapped_properties.items() if v}
+    
+    def create_contact(self, contact_data, retry_count=3, tags=None):
         """
         Create contact in HubSpot with retry logic
         Maps name → first_name/last_name
+        tags are set in the create request; an existing contact is tagged via tag_contact
         """
         if not self.client:
             return None
@@ -109,27 +164,9 @@ class HubSpotService:
         self._handle_rate_limit()
         
         try:
-            # Split name into first_name and last_name
-            name = contact_data.get('name', '') or f"{contact_data.get('first_name', '')} {contact_data.get('last_name', '')}".strip()
-            if name and not contact_data.get('first_name'):
-                first_name, last_name = self._split_name(name)
-                contact_data['first_name'] = first_name
-                contact_data['last_name'] = last_name
-            
-            # Map fields
-            properties = {
-                'email': contact_data.get('email', ''),
-                'firstname': contact_data.get('first_name', ''),
-                'lastname': contact_data.get('last_name', ''),
-                'phone': contact_data.get('phone', ''),
-                'company': contact_data.get('company', ''),
-            }
-            
-            # Apply custom field mapping
-            mapped_properties = self._map_fields(properties, 'contact')
-            
-            # Remove empty values
-            properties = {k: v for k, v in mapped_properties.items() if v}
+            properties = self._contact_properties(contact_data)
+            if tags:
+                properties['tags'] = ';'.join(tags)
             
             # Create contact
             api_response = self.client.crm.contacts.basic_api.create(
@@ -141,12 +178,15 @@ class HubSpotService:
         
         except ContactsApiException as e:
             if e.status == 409:  # Contact already exists
-                # Try to find existing contact
-                return self.search_contact_by_email(contact_data.get('email', ''))
+                # Try to find existing contact, merging tags into its current ones
+                existing = self.search_contact_by_email(contact_data.get('email', ''))
+                if existing and tags:
+                    self.tag_contact(existing['id'], tags)
+                return existing
             elif retry_count > 0:
                 logger.warning(f"HubSpot API error, retrying: {str(e)}")
                 time.sleep(1)
-                return self.create_contact(contact_data, retry_count - 1)
+                return self.create_contact(contact_data, retry_count - 1, tags=tags)
             else:
                 logger.error(f"HubSpot create_contact error: {str(e)}")
                 return None
@@ -217,17 +257,16 @@ class HubSpotService:
             mapped_properties = self._map_fields(properties, 'deal')
             properties = {k: v for k, v in mapped_properties.items() if v}
             
-            # Create deal
-            api_response = self.client.crm.deals.basic_api.create(
-                simple_public_object_input={'properties': properties}
-            )
+            # Create deal, associated with the contact in the same request
+            api_response = self.client.crm.deals.basic_api.create({
+                'properties': properties,
+                'associations': self._contact_associations(
+                    associated_contact_id, self.DEAL_TO_CONTACT_ASSOCIATION
+                ),
+            })
             
             deal_id = api_response.id
             
-            # Associate with contact if provided
-            if associated_contact_id:
-                self.associate_deal_with_contact(deal_id, associated_contact_id)
-            
             logger.info(f"HubSpot deal created: {deal_id}")
             return {'id': deal_id, 'properties': api_response.properties}
         
@@ -261,24 +300,14 @@ class HubSpotService:
                 'hs_note_body': note_content,
             }
             
-            api_response = notes_api.create(
-                simple_public_object_input={'properties': note_properties}
-            )
+            # Associate the note with the contact in the same request
+            api_response = notes_api.create({
+                'properties': note_properties,
+                'associations': self._contact_associations(contact_id, self.NOTE_TO_CONTACT_ASSOCIATION),
+            })
             
             note_id = api_response.id
             
-            # Associate note with contact
-            try:
-                associations_api = self.client.crm.notes.associations_api
-                associations_api.create(
-                    note_id=note_id,
-                    to_object_type='contacts',
-                    to_object_id=contact_id,
-                    association_type='note_to_contact'
-                )
-            except Exception as assoc_error:
-                logger.warning(f"Failed to associate note with contact: {str(assoc_error)}")
-            
             logger.info(f"HubSpot note added to contact: {contact_id}")
             return {'id': note_id}
         
@@ -387,7 +416,10 @@ class HubSpotService:
     
     def batch_create_contacts(self, contacts_data):
         """
-        Batch create contacts (up to batch_size)
+        Batch create contacts with one batch API request per batch_size contacts
+        HubSpot rejects a whole batch if any contact already exists, so a failed
+        batch falls back to create_contact per item (which resolves duplicates)
+        Returns: list of {'id', 'properties'} dicts, not necessarily in input order
         """
         if not self.client:
             return []
@@ -395,14 +427,22 @@ class HubSpotService:
         results = []
         for i in range(0, len(contacts_data), self.batch_size):
             batch = contacts_data[i:i + self.batch_size]
-            batch_results = []
+            self._handle_rate_limit()
             
-            for contact_data in batch:
-                result = self.create_contact(contact_data)
-                if result:
-                    batch_results.append(result)
-            
-            results.extend(batch_results)
+            try:
+                api_response = self.client.crm.contacts.batch_api.create(
+                    {'inputs': [{'properties': self._contact_properties(contact_data)} for contact_data in batch]}
+                )
+                results.extend(
+                    {'id': contact.id, 'properties': contact.properties} for contact in api_response.results
+                )
+                logger.info(f"HubSpot batch created {len(api_response.results)} contacts")
+            except Exception as e:
+                logger.warning(f"HubSpot batch create failed, creating individually: {str(e)}")
+                for contact_data in batch:
+                    result = self.create_contact(contact_data)
+                    if result:
+                        results.append(result)
         
         return results
 
@@ -80,3 +80,17 @@ def update_ab_test_stats():
         ABTestingService.update_test_stats(test)
     logger.info(f"Updated statistics for {active_tests.count()} A/B tests")
 
+
+
+@shared_task(bind=True, max_retries=3)
+def anonymize_records_task(self, key, ids, email, reason='GDPR deletion', keep_audit=True):
+    """
+    Celery task anonymizing one primary-key chunk queued by anonymize_by_email_async
+    """
+    from .anonymization_service import AnonymizationService
+    
+    try:
+        return AnonymizationService.anonymize_records(key, ids, email, reason, keep_audit)
+    except Exception as e:
+        logger.error(f"Anonymization task error ({key}): {str(e)}")
+        raise self.retry(exc=e, countdown=60 * (2 ** self.request.retries))
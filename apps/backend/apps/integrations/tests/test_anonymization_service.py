@@ -1,9 +1,13 @@
 """
 Tests for Anonymization Service
 """
+from unittest.mock import patch
 from django.test import TestCase
 from apps.integrations.anonymization_service import AnonymizationService
+from apps.contacts.models import ContactSubmission
 from apps.contacts.tests.factories import ContactSubmissionFactory
+from apps.leads.models import Lead
+from apps.leads.tests.factories import LeadFactory
 
 
 class AnonymizationServiceTest(TestCase):
@@ -25,6 +29,16 @@ class AnonymizationServiceTest(TestCase):
         
         self.assertEqual(anonymized, 'user@anonymous.com')
     
+    def test_anonymize_blank_values(self):
+        """Test blank and malformed values get the generic replacement without hashing"""
+        with patch('apps.integrations.anonymization_service._sha256_prefix') as mock_hash:
+            self.assertEqual(AnonymizationService.anonymize_email('   '), 'user@anonymous.com')
+            self.assertEqual(AnonymizationService.anonymize_email('not-an-email'), 'user@anonymous.com')
+            self.assertEqual(AnonymizationService.anonymize_name(' ', method='hash'), 'Anonymous User')
+            self.assertEqual(AnonymizationService.anonymize_phone(' ', method='hash'), '')
+            self.assertIsNone(AnonymizationService.anonymize_ip(' '))
+        mock_hash.assert_not_called()
+    
     def test_anonymize_name_replace(self):
         """Test name anonymization"""
         original = 'John Doe'
@@ -46,6 +60,14 @@ class AnonymizationServiceTest(TestCase):
         
         self.assertEqual(anonymized, '192.168.1.0')
     
+    def test_anonymize_ipv6_truncate(self):
+        """Test IPv6 truncation keeps only the /64 prefix"""
+        self.assertEqual(
+            AnonymizationService.anonymize_ip('2001:db8:85a3::8a2e:370:7334', method='truncate'),
+            '2001:db8:85a3::'
+        )
+        self.assertEqual(AnonymizationService.anonymize_ip('not-an-ip', method='truncate'), 'not-an-ip')
+    
     def test_remove_pii_from_text(self):
         """Test removing PII from text"""
         text = 'Contact me at user@example.com or call 123-456-7890'
@@ -56,6 +78,28 @@ class AnonymizationServiceTest(TestCase):
         self.assertIn('[EMAIL_REMOVED]', cleaned)
         self.assertIn('[PHONE_REMOVED]', cleaned)
     
+    def test_remove_pii_from_text_without_pii(self):
+        """Test text without '@' or digits is returned unchanged"""
+        text = 'Hello, I would like to know more about pricing.'
+        self.assertIs(AnonymizationService.remove_pii_from_text(text), text)
+    
+    def test_remove_pii_from_text_extra_patterns(self):
+        """Test extra patterns are replaced alongside the built-in ones"""
+        cleaned = AnonymizationService.remove_pii_from_text(
+            'Licence AB-XYZ, mail a@b.co', extra_patterns=[r'AB-[A-Z]{3}']
+        )
+        self.assertEqual(cleaned, 'Licence [PII_REMOVED], mail [EMAIL_REMOVED]')
+    
+    def test_remove_pii_from_text_all_types(self):
+        """Test each PII type is replaced with its own tag"""
+        text = 'ssn 123-45-6789, card 4111111111111111, ip 10.0.0.1, mail a@b.co'
+        cleaned = AnonymizationService.remove_pii_from_text(text)
+        
+        self.assertEqual(
+            cleaned,
+            'ssn [SSN_REMOVED], card [CARD_REMOVED], ip [IP_REMOVED], mail [EMAIL_REMOVED]'
+        )
+    
     def test_anonymize_contact_submission(self):
         """Test anonymizing contact submission"""
         contact = ContactSubmissionFactory()
@@ -68,4 +112,77 @@ class AnonymizationServiceTest(TestCase):
         self.assertNotEqual(contact.email, original_email)
         self.assertNotEqual(contact.name, original_name)
         self.assertIn('anonymous', contact.email.lower())
-
+    
+    def test_anonymize_by_email(self):
+        """Test all records for an email get the same anonymized email"""
+        ContactSubmissionFactory(email='Jane@Example.com')
+        LeadFactory(email='jane@example.com')
+        
+        summary = AnonymizationService.anonymize_by_email(' jane@example.com ')
+        
+        expected = AnonymizationService.anonymize_email('jane@example.com')
+        self.assertEqual(summary['records_anonymized']['contacts'], 1)
+        self.assertEqual(summary['records_anonymized']['leads'], 1)
+        self.assertEqual(ContactSubmission.objects.get().email, expected)
+        self.assertEqual(Lead.objects.get().email, expected)
+    
+    def test_anonymize_by_email_bulk_updates(self):
+        """Test matched rows are written with one UPDATE per model"""
+        ContactSubmissionFactory.create_batch(3, email='bulk@example.com')
+        
+        # Existence probe, then SAVEPOINT, SELECT, UPDATE, RELEASE for contacts only
+        with self.assertNumQueries(5):
+            summary = AnonymizationService.anonymize_by_email('bulk@example.com', keep_audit=False)
+        
+        self.assertEqual(summary['records_anonymized']['contacts'], 3)
+        self.assertFalse(ContactSubmission.objects.filter(email='bulk@example.com').exists())
+    
+    @patch.object(AnonymizationService, 'BULK_UPDATE_BATCH_SIZE', 2)
+    def test_anonymize_by_email_in_batches(self):
+        """Test rows are written across several bulk_update batches"""
+        ContactSubmissionFactory.create_batch(5, email='batch@example.com')
+        
+        summary = AnonymizationService.anonymize_by_email('batch@example.com', keep_audit=False)
+        
+        self.assertEqual(summary['records_anonymized']['contacts'], 5)
+        self.assertFalse(ContactSubmission.objects.filter(email='batch@example.com').exists())
+    
+    def test_anonymize_by_email_bulk_audit(self):
+        """Test audit rows are inserted with one INSERT per batch"""
+        from apps.gdpr.models import DataDeletionAudit
+        ContactSubmissionFactory.create_batch(3, email='audit@example.com')
+        
+        # Existence probe, then SAVEPOINT, SELECT, UPDATE, audit INSERT, RELEASE
+        with self.assertNumQueries(6):
+            AnonymizationService.anonymize_by_email('audit@example.com')
+        
+        self.assertEqual(DataDeletionAudit.objects.filter(deletion_type='anonymize').count(), 3)
+    
+    def test_anonymize_by_email_unknown(self):
+        """Test an unknown email costs a single query"""
+        with self.assertNumQueries(1):
+            summary = AnonymizationService.anonymize_by_email('nobody@example.com')
+        
+        self.assertEqual(
+            summary['records_anonymized'],
+            {'contacts': 0, 'waitlist': 0, 'leads': 0, 'newsletter': 0}
+        )
+    
+    def test_anonymize_records_skips_anonymized_rows(self):
+        """Test a re-run of the same chunk leaves already anonymized rows alone"""
+        contact = ContactSubmissionFactory(email='chunk@example.com')
+        
+        self.assertEqual(AnonymizationService.anonymize_records('contacts', [contact.pk], 'chunk@example.com'), 1)
+        self.assertEqual(AnonymizationService.anonymize_records('contacts', [contact.pk], 'chunk@example.com'), 0)
+    
+    @patch('celery.group')
+    def test_anonymize_by_email_async_chunks(self, mock_group):
+        """Test one task is queued per primary-key chunk"""
+        ContactSubmissionFactory.create_batch(3, email='async@example.com')
+        
+        summary = AnonymizationService.anonymize_by_email_async('async@example.com', chunk_size=2)
+        
+        self.assertEqual(summary['records_queued']['contacts'], 3)
+        signatures = list(mock_group.call_args[0][0])
+        self.assertEqual([len(sig.args[1]) for sig in signatures], [2, 1])
+        mock_group.return_value.apply_async.assert_called_once()
@@ -38,4 +38,127 @@ class CRMServiceTest(TestCase):
         # Should return True if task was queued
         # Mock task might not be called in test environment
         self.assertIsNotNone(result)
+    
+    def test_sync_contact_submission_tags_on_create(self):
+        """Test the HubSpot source tag is sent with the create, then the note"""
+        self.crm_service.provider = MagicMock()
+        self.crm_service.provider_name = 'hubspot'
+        self.crm_service.provider.create_contact.return_value = {'id': '123'}
+        submission = ContactSubmissionFactory(source='Landing Page')
+        
+        self.assertTrue(self.crm_service.sync_contact_submission(submission))
+        
+        self.crm_service.provider.create_note.assert_called_once()
+        self.crm_service.provider.create_contact.assert_called_once()
+        self.assertEqual(
+            self.crm_service.provider.create_contact.call_args[1], {'tags': ['source_landing_page']}
+        )
+        self.crm_service.provider.service.tag_contact.assert_not_called()
+    
+    def test_sync_status_change_deduplicated(self):
+        """Test a repeated status change is sent to the CRM once"""
+        from django.core.cache import cache
+        self.crm_service.provider = MagicMock()
+        self.addCleanup(cache.clear)
+        
+        self.assertTrue(self.crm_service.sync_status_change('lead', 'c1', 'contacted'))
+        self.assertTrue(self.crm_service.sync_status_change('lead', 'c1', 'contacted'))
+        self.assertTrue(self.crm_service.sync_status_change('lead', 'c1', 'qualified'))
+        
+        self.assertEqual(self.crm_service.provider.create_note.call_count, 2)
+    
+    def test_sync_status_change_repeated_events_not_deduplicated(self):
+        """Test distinct status change events to the same status are all sent"""
+        from django.core.cache import cache
+        self.crm_service.provider = MagicMock()
+        self.addCleanup(cache.clear)
+        
+        for event_id, (previous, new) in enumerate([('new', 'contacted'), ('contacted', 'new'), ('new', 'contacted')]):
+            self.assertTrue(self.crm_service.sync_status_change(
+                'lead', 'c1', new, previous_status=previous, event_id=event_id
+            ))
+        
+        self.assertEqual(self.crm_service.provider.create_note.call_count, 3)
+    
+    def test_sync_status_change_failed_note_allows_retry(self):
+        """Test a provider that returns None is a failure and does not block the retry"""
+        from django.core.cache import cache
+        self.crm_service.provider = MagicMock()
+        self.crm_service.provider.create_note.side_effect = [None, {'id': '1'}]
+        self.addCleanup(cache.clear)
+        
+        self.assertFalse(self.crm_service.sync_status_change('lead', 'c1', 'contacted'))
+        self.assertTrue(self.crm_service.sync_status_change('lead', 'c1', 'contacted'))
+        
+        self.assertEqual(self.crm_service.provider.create_note.call_count, 2)
+    
+    def test_map_fields(self):
+        """Test configured fields are renamed and others pass through"""
+        self.crm_service.field_mapping = {'company': 'Company__c'}
+        self.assertEqual(
+            self.crm_service._map_fields({'email': 'a@example.com', 'company': 'Acme'}),
+            {'email': 'a@example.com', 'Company__c': 'Acme'}
+        )
+
 
+class PipedriveCRMProviderTest(TestCase):
+    """Test Pipedrive CRM provider"""
+    
+    @patch('apps.integrations.crm_service._HTTP_SESSION')
+    def test_requests_share_session(self, mock_session):
+        """Test API calls go through the shared keep-alive session"""
+        from apps.integrations.crm_service import PipedriveCRMProvider
+        mock_session.post.return_value.json.return_value = {'data': {'id': 1}}
+        provider = PipedriveCRMProvider()
+        
+        provider.create_contact({'first_name': 'Jane', 'email': 'jane@example.com'})
+        provider.create_deal({'name': 'Deal'})
+        
+        self.assertEqual(mock_session.post.call_count, 2)
+        self.assertTrue(mock_session.post.call_args[0][0].endswith('/deals'))
+
+
+class SalesforceCRMProviderTest(TestCase):
+    """Test Salesforce CRM provider"""
+    
+    @patch('simple_salesforce.Salesforce')
+    def test_connection_reused(self, mock_salesforce):
+        """Test one login serves several calls"""
+        from apps.integrations.crm_service import SalesforceCRMProvider
+        provider = SalesforceCRMProvider()
+        
+        provider.create_contact({'email': 'jane@example.com'})
+        provider.create_lead({'email': 'jane@example.com'})
+        
+        mock_salesforce.assert_called_once()
+        self.assertEqual(mock_salesforce.return_value.Lead.create.call_count, 1)
+    
+    @patch('simple_salesforce.Salesforce')
+    def test_expired_session_relogin(self, mock_salesforce):
+        """Test an expired session logs in again and retries once"""
+        from simple_salesforce.exceptions import SalesforceExpiredSession
+        from apps.integrations.crm_service import SalesforceCRMProvider
+        mock_salesforce.return_value.Contact.create.side_effect = [
+            SalesforceExpiredSession('url', 401, 'Contact', 'expired'),
+            {'id': '003'},
+        ]
+        provider = SalesforceCRMProvider()
+        
+        result = provider.create_contact({'email': 'jane@example.com'})
+        
+        self.assertEqual(result, {'id': '003'})
+        self.assertEqual(mock_salesforce.call_count, 2)
+    
+    @patch('simple_salesforce.Salesforce')
+    def test_search_contact_escapes_email(self, mock_salesforce):
+        """Test quotes in the email cannot break out of the SOQL string"""
+        from apps.integrations.crm_service import SalesforceCRMProvider
+        mock_salesforce.return_value.query.return_value = {'records': []}
+        
+        SalesforceCRMProvider().search_contact(" O'Neil@Example.com' OR Name != '")
+        
+        query = mock_salesforce.return_value.query.call_args[0][0]
+        self.assertEqual(
+            query,
+            "SELECT Id, Name, Email FROM Contact WHERE Email = 'o\\'neil@example.com\\' or name != \\''"
+        )
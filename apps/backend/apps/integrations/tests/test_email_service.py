@@ -36,3 +36,46 @@ class EmailServiceTest(TestCase):
         # In test, might send synchronously, but we can check the method was called
         # The actual behavior depends on Celery configuration
 
+    
+    @patch('apps.integrations.email_service.get_connection')
+    def test_batch_connection_reused(self, mock_get_connection):
+        """Test sends inside batch_connection share one opened connection"""
+        connection = mock_get_connection.return_value
+        context = {'name': 'Jane', 'subject': 'Hi', 'submission_id': '1'}
+        
+        with self.email_service.batch_connection():
+            for to_email in ['a@example.com', 'b@example.com']:
+                self.email_service.send_email('Hi', to_email, 'contact_confirmation', context, use_celery=False)
+        
+        connection.open.assert_called_once()
+        self.assertEqual(connection.send_messages.call_count, 2)
+        connection.close.assert_called_once()
+    
+    @patch('apps.integrations.email_service.get_connection')
+    def test_batch_connection_reconnects_once(self, mock_get_connection):
+        """Test a dropped batch connection is reopened and the send retried"""
+        from smtplib import SMTPServerDisconnected
+        connection = mock_get_connection.return_value
+        connection.send_messages.side_effect = [SMTPServerDisconnected(), 1, 1]
+        context = {'name': 'Jane', 'subject': 'Hi', 'submission_id': '1'}
+        
+        with self.email_service.batch_connection():
+            results = [
+                self.email_service.send_email('Hi', to_email, 'contact_confirmation', context, use_celery=False)
+                for to_email in ['a@example.com', 'b@example.com']
+            ]
+        
+        self.assertEqual(results, [True, True])
+        self.assertEqual(connection.open.call_count, 2)
+        self.assertEqual(connection.send_messages.call_count, 3)
+    
+    @patch.object(EmailService, '_is_celery_available', return_value=False)
+    def test_celery_availability_checked_once(self, mock_available):
+        """Test Celery availability is looked up on the first send only"""
+        context = {'name': 'Jane', 'subject': 'Hi', 'submission_id': '1'}
+        
+        for to_email in ['a@example.com', 'b@example.com']:
+            self.email_service.send_email('Hi', to_email, 'contact_confirmation', context)
+        
+        mock_available.assert_called_once()
+        self.assertEqual(len(mail.outbox), 2)
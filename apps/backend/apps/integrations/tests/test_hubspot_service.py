@@ -0,0 +1,78 @@
+"""
+Tests for HubSpot Service
+"""
+from unittest.mock import MagicMock, patch
+from django.test import TestCase
+from apps.integrations.hubspot_service import HubSpotService
+
+
+class HubSpotServiceTest(TestCase):
+    """Test HubSpot Service"""
+    
+    def setUp(self):
+        """Set up HubSpot service with a mocked client"""
+        self.service = HubSpotService()
+        self.service.client = MagicMock()
+        self.service.min_request_interval = 0
+        self.service.batch_size = 2
+    
+    def test_batch_create_contacts(self):
+        """Test contacts are sent through the batch API, batch_size at a time"""
+        batch_api = self.service.client.crm.contacts.batch_api
+        batch_api.create.return_value.results = [MagicMock(id='1', properties={})]
+        contacts = [{'email': f'user{i}@example.com', 'name': 'Jane Doe'} for i in range(3)]
+        
+        self.service.batch_create_contacts(contacts)
+        
+        self.assertEqual(batch_api.create.call_count, 2)
+        inputs = batch_api.create.call_args_list[0][0][0]['inputs']
+        self.assertEqual(inputs[0]['properties']['firstname'], 'Jane')
+        self.service.client.crm.contacts.basic_api.create.assert_not_called()
+    
+    def test_batch_create_contacts_fallback(self):
+        """Test a rejected batch is retried contact by contact"""
+        self.service.client.crm.contacts.batch_api.create.side_effect = Exception('conflict')
+        basic_api = self.service.client.crm.contacts.basic_api
+        basic_api.create.return_value = MagicMock(id='9', properties={})
+        
+        results = self.service.batch_create_contacts([{'email': 'a@example.com'}, {'email': 'b@example.com'}])
+        
+        self.assertEqual(basic_api.create.call_count, 2)
+        self.assertEqual([result['id'] for result in results], ['9', '9'])
+    
+    def test_create_contact_with_tags(self):
+        """Test tags are set in the create request without a follow-up update"""
+        basic_api = self.service.client.crm.contacts.basic_api
+        basic_api.create.return_value = MagicMock(id='7', properties={})
+        
+        self.service.create_contact({'email': 'a@example.com'}, tags=['source_blog'])
+        
+        properties = basic_api.create.call_args[1]['simple_public_object_input']['properties']
+        self.assertEqual(properties['tags'], 'source_blog')
+        basic_api.update.assert_not_called()
+    
+    def test_add_timeline_note_associates_inline(self):
+        """Test the note is created already associated with the contact"""
+        notes_api = self.service.client.crm.notes
+        notes_api.basic_api.create.return_value = MagicMock(id='n1')
+        
+        self.assertEqual(self.service.add_timeline_note('42', 'Hello'), {'id': 'n1'})
+        
+        payload = notes_api.basic_api.create.call_args[0][0]
+        self.assertEqual(payload['associations'][0]['to'], {'id': '42'})
+        self.assertEqual(payload['associations'][0]['types'][0]['associationTypeId'], 202)
+        notes_api.associations_api.create.assert_not_called()
+    
+    @patch('apps.integrations.hubspot_service.time.sleep')
+    def test_rate_limit_allows_bursts(self, mock_sleep):
+        """Test a burst within the bucket does not sleep, and the next request waits"""
+        self.service.min_request_interval = 0.1
+        self.service._rate_tokens = self.service.rate_limit_burst
+        
+        for _ in range(self.service.rate_limit_burst):
+            self.service._handle_rate_limit()
+        mock_sleep.assert_not_called()
+        
+        self.service._handle_rate_limit()
+        mock_sleep.assert_called_once()
+        self.assertLessEqual(mock_sleep.call_args[0][0], 0.1)
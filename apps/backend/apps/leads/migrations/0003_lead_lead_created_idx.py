@@ -0,0 +1,17 @@
+# Generated by Django 4.2.27 on 2026-10-16 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0002_lead_ab_test_name_lead_ab_test_variant'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='lead',
+            index=models.Index(fields=['created_at'], name='lead_created_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.27 on 2026-10-16 11:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0003_lead_lead_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='lead',
+            index=models.Index(condition=models.Q(('status', 'qualified')), fields=['created_at'], name='lead_qualified_idx'),
+        ),
+    ]
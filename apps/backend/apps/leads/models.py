@@ -76,6 +76,10 @@ class Lead(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Lead'
         verbose_name_plural = 'Leads'
+        indexes = [
+            models.Index(fields=['created_at'], name='lead_created_idx'),
+            models.Index(fields=['created_at'], name='lead_qualified_idx', condition=models.Q(status='qualified')),
+        ]
     
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.email})"
@@ -172,11 +172,12 @@ class NewsletterSubscriptionAdmin(ImportExportModelAdmin):
         """Send welcome emails to selected subscriptions"""
         count = 0
         email_service = EmailService()
+        # Sends are queued to Celery, so there is no SMTP connection to batch here
         for subscription in queryset:
             if subscription.subscription_status == 'subscribed' and subscription.is_verified:
                 try:
-                    email_service.send_newsletter_welcome(subscription)
-                    count += 1
+                    if email_service.send_newsletter_welcome(subscription):
+                        count += 1
                 except Exception as e:
                     self.message_user(request, f'Error sending email to {subscription.email}: {str(e)}', level='error')
         self.message_user(request, f'Welcome emails sent to {count} subscriptions.')
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.27 on 2026-10-16 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('newsletter', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='newslettersubscription',
+            index=models.Index(fields=['created_at'], name='newsletter_created_idx'),
+        ),
+    ]
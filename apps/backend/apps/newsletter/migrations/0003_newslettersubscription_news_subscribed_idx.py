@@ -0,0 +1,17 @@
+# Generated by Django 4.2.27 on 2026-10-16 11:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('newsletter', '0002_newslettersubscription_newsletter_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='newslettersubscription',
+            index=models.Index(condition=models.Q(('subscription_status', 'subscribed')), fields=['created_at'], name='news_subscribed_idx'),
+        ),
+    ]
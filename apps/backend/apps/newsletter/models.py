@@ -80,6 +80,10 @@ class NewsletterSubscription(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Newsletter Subscription'
         verbose_name_plural = 'Newsletter Subscriptions'
+        indexes = [
+            models.Index(fields=['created_at'], name='newsletter_created_idx'),
+            models.Index(fields=['created_at'], name='news_subscribed_idx', condition=models.Q(subscription_status='subscribed')),
+        ]
     
     def __str__(self):
         return f"{self.email} ({self.get_subscription_status_display()})"
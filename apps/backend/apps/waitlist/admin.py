@@ -192,12 +192,13 @@ class WaitlistEntryAdmin(ImportExportModelAdmin):
         """Send verification emails to selected entries"""
         count = 0
         email_service = EmailService()
-        for entry in queryset:
-            if not entry.is_verified:
-                try:
-                    email_service.send_waitlist_verification(entry)
-                    count += 1
-                except Exception as e:
-                    self.message_user(request, f'Error sending verification to {entry.email}: {str(e)}', level='error')
+        with email_service.batch_connection():
+            for entry in queryset:
+                if not entry.is_verified:
+                    try:
+                        if email_service.send_waitlist_verification(entry):
+                            count += 1
+                    except Exception as e:
+                        self.message_user(request, f'Error sending verification to {entry.email}: {str(e)}', level='error')
         self.message_user(request, f'Verification emails sent to {count} entries.')
     send_verification_emails.short_description = "Send verification emails"
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.27 on 2026-10-16 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('waitlist', '0002_waitlistentry_ab_test_name_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='waitlistentry',
+            index=models.Index(fields=['created_at'], name='waitlist_created_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.27 on 2026-10-16 11:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('waitlist', '0003_waitlistentry_waitlist_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='waitlistentry',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['created_at'], name='waitlist_pending_idx'),
+        ),
+    ]
@@ -98,6 +98,10 @@ class WaitlistEntry(models.Model):
         ordering = ['-priority_score', '-created_at']
         verbose_name = 'Waitlist Entry'
         verbose_name_plural = 'Waitlist Entries'
+        indexes = [
+            models.Index(fields=['created_at'], name='waitlist_created_idx'),
+            models.Index(fields=['created_at'], name='waitlist_pending_idx', condition=models.Q(status='pending')),
+        ]
     
     def __str__(self):
         return f"{self.email} ({self.get_status_display()})"
@@ -214,7 +214,7 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'apps.core.pagination.CachedCountPageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': [
         'rest_framework.filters.SearchFilter',
@@ -409,6 +409,30 @@ WEBHOOK_SECRET_KEY = config('WEBHOOK_SECRET_KEY', default='')
 WEBHOOK_RETRY_ATTEMPTS = config('WEBHOOK_RETRY_ATTEMPTS', default=3, cast=int)
 WEBHOOK_RETRY_DELAY = config('WEBHOOK_RETRY_DELAY', default=60, cast=int)
 
+# Contact Spam Check Configuration
+# Submissions still pending_spam_check after this many minutes are re-queued
+# by the requeue_stale_spam_checks beat task (lost broker message, failed task)
+CONTACT_SPAM_CHECK_STALE_MINUTES = config('CONTACT_SPAM_CHECK_STALE_MINUTES', default=5, cast=int)
+
+# Dashboard Configuration
+# Run the per-app dashboard aggregates on separate threads/DB connections;
+# only worthwhile when new connections are cheap (e.g. behind PgBouncer)
+DASHBOARD_STATS_PARALLEL = config('DASHBOARD_STATS_PARALLEL', default=False, cast=bool)
+# Read completed days of the trend windows from the SiteDailyStats rollup;
+# run `manage.py backfill_daily_stats` before enabling
+DASHBOARD_STATS_USE_ROLLUP = config('DASHBOARD_STATS_USE_ROLLUP', default=False, cast=bool)
+# Trailing days the nightly rollup job rebuilds, so missed runs and recent
+# status changes (unsubscribes, spam re-flags) are picked up; older days
+# only change via `manage.py backfill_daily_stats`
+DASHBOARD_STATS_REFRESH_DAYS = config('DASHBOARD_STATS_REFRESH_DAYS', default=3, cast=int)
+# Seconds a process serves its in-memory Site index before reloading it.
+# Site edits reach other processes immediately through the shared cache
+# (Redis); with the LocMem fallback this TTL is the only way they see them
+SITE_CACHE_TTL = config('SITE_CACHE_TTL', default=60, cast=int)
+# API list totals at or above this many rows are cached for the timeout (seconds)
+PAGINATION_COUNT_CACHE_MIN_ROWS = config('PAGINATION_COUNT_CACHE_MIN_ROWS', default=10000, cast=int)
+PAGINATION_COUNT_CACHE_TIMEOUT = config('PAGINATION_COUNT_CACHE_TIMEOUT', default=60, cast=int)
+
 # A/B Testing Configuration
 AB_TESTING_ENABLED = config('AB_TESTING_ENABLED', default=True, cast=bool)
 
@@ -430,12 +454,20 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'apps.integrations.tasks.retry_failed_webhooks',
         'schedule': 300.0,  # Every 5 minutes
     },
+    'requeue-stale-spam-checks': {
+        'task': 'apps.contacts.tasks.requeue_stale_spam_checks',
+        'schedule': 300.0,  # Every 5 minutes
+    },
     'update-ab-test-stats': {
         'task': 'apps.integrations.tasks.update_ab_test_stats',
         'schedule': 3600.0,  # Every hour
     },
     'apply-data-retention-policies': {
-        'task': 'apps.integrations.tasks.apply_data_retention_policies',
+        'task': 'apps.gdpr.tasks.apply_data_retention_policies',
+        'schedule': 86400.0,  # Daily
+    },
+    'refresh-site-daily-stats': {
+        'task': 'apps.core.tasks.refresh_daily_stats',
         'schedule': 86400.0,  # Daily
     },
 }